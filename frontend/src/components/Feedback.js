@@ -109,6 +109,50 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
         }
     };
 
+    // Read a server-sent event stream of description deltas. Calls onDelta with
+    // the text so far and resolves with the payload of the final "done" event.
+    const readDescriptionStream = async (response, onDelta) => {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+                throw new Error('Stream ended before the description was complete');
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventType = 'message';
+                let data = '';
+                for (const line of rawEvent.split('\n')) {
+                    if (line.startsWith('event: ')) eventType = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                const payload = JSON.parse(data);
+
+                if (eventType === 'error') throw new Error(payload.detail);
+                if (eventType === 'done') return payload;
+                text += payload.delta;
+                onDelta(text);
+            }
+        }
+    };
+
+    const showPartialDescription = (index, text) => {
+        setPhases((current) => {
+            const updated = [...current];
+            updated[index] = { ...updated[index], description: text };
+            return updated;
+        });
+    };
+
     const handleRefinePhase = async () => {
         if (!userFeedback.trim()) {
             alert('Please provide feedback to help improve the description');
@@ -121,10 +165,12 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
             const formData = new FormData();
             formData.append('user_feedback', userFeedback);
 
+            const phaseIndex = currentIndex;
             const response = await fetch(
-                `${API_BASE_URL}/api/v1/video/${videoId}/phase/${currentIndex}/refine`,
+                `${API_BASE_URL}/api/v1/video/${videoId}/phase/${phaseIndex}/refine`,
                 {
                     method: 'POST',
+                    headers: { Accept: 'text/event-stream' },
                     body: formData
                 }
             );
@@ -133,19 +179,24 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
                 throw new Error('Failed to refine phase');
             }
 
-            const data = await response.json();
+            // Show the description as it is generated
+            setShowRefineModal(false);
+            const data = await readDescriptionStream(
+                response, (text) => showPartialDescription(phaseIndex, text)
+            );
 
             // Update the phase with refined description
-            const updatedPhases = [...phases];
-            updatedPhases[currentIndex] = {
-                ...updatedPhases[currentIndex],
-                description: data.refined_description,
-                refined: true
-            };
-            setPhases(updatedPhases);
-
-            // Close modal and clear feedback - user will review the refined phase
-            setShowRefineModal(false);
+            setPhases((current) => {
+                const updated = [...current];
+                updated[phaseIndex] = {
+                    ...updated[phaseIndex],
+                    description: data.refined_description,
+                    refined: true
+                };
+                return updated;
+            });
+
+            // Clear feedback - user will review the refined phase
             setUserFeedback('');
             setRefining(false);
 
@@ -190,17 +241,19 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
         }
     };
 
-    const handleSelectAlternativeFrame = async (alternativeFrame) => {
+    const handleSelectAlternativeFrame = async (alternativeFrame, alternativeIndex) => {
         setLoadingAlternatives(true);  // Show loading state
         try {
+            // The server already holds this frame's JPEG; send only a reference to it
             const formData = new FormData();
-            formData.append('new_timestamp', alternativeFrame.timestamp_seconds);
-            formData.append('new_image_base64', alternativeFrame.image_base64);
+            formData.append('alternative_index', alternativeIndex);
 
+            const phaseIndex = currentIndex;
             const response = await fetch(
-                `${API_BASE_URL}/api/v1/video/${videoId}/phase/${currentIndex}/update-keyframe`,
+                `${API_BASE_URL}/api/v1/video/${videoId}/phase/${phaseIndex}/update-keyframe`,
                 {
                     method: 'POST',
+                    headers: { Accept: 'text/event-stream' },
                     body: formData
                 }
             );
@@ -209,22 +262,33 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
                 throw new Error('Failed to update keyframe');
             }
 
-            const data = await response.json();
-
-            // Update the current phase with new keyframe AND regenerated description
-            const updatedPhases = [...phases];
-            updatedPhases[currentIndex] = {
-                ...updatedPhases[currentIndex],
-                image_base64: alternativeFrame.image_base64,
-                key_timestamp: alternativeFrame.timestamp,
-                description: data.new_description,  // Update with regenerated description
-                description_regenerated: true
-            };
-            setPhases(updatedPhases);
-
-            // Close the selector
+            // Show the new keyframe and its description as it is generated
             setShowKeyframeSelector(false);
             setAlternativeFrames([]);
+            setPhases((current) => {
+                const updated = [...current];
+                updated[phaseIndex] = {
+                    ...updated[phaseIndex],
+                    image_base64: undefined,
+                    image_url: `${API_BASE_URL}${alternativeFrame.url}`,
+                    key_timestamp: alternativeFrame.timestamp
+                };
+                return updated;
+            });
+            const data = await readDescriptionStream(
+                response, (text) => showPartialDescription(phaseIndex, text)
+            );
+
+            // Update the phase with the final regenerated description
+            setPhases((current) => {
+                const updated = [...current];
+                updated[phaseIndex] = {
+                    ...updated[phaseIndex],
+                    description: data.new_description,
+                    description_regenerated: true
+                };
+                return updated;
+            });
             setLoadingAlternatives(false);
 
         } catch (err) {
@@ -327,11 +391,11 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
                 Phase {currentIndex + 1} of {phases.length}
             </p>
             <div className="feedback-card" key={currentIndex}>
-                {currentPhase.image_base64 && (
+                {(currentPhase.image_url || currentPhase.image_base64) && (
                     <div className="feedback-image-container">
                         <img
                             key={`phase-image-${currentIndex}`}
-                            src={`data:image/jpeg;base64,${currentPhase.image_base64}`}
+                            src={currentPhase.image_url || `data:image/jpeg;base64,${currentPhase.image_base64}`}
                             alt={`Surgical phase ${currentIndex + 1}`}
                             className="feedback-image"
                         />
@@ -447,10 +511,10 @@ const Feedback = ({ onFeedbackComplete, videoId }) => {
                                     <div
                                         key={index}
                                         className="alternative-frame-item"
-                                        onClick={() => handleSelectAlternativeFrame(frame)}
+                                        onClick={() => handleSelectAlternativeFrame(frame, index)}
                                     >
                                         <img
-                                            src={`data:image/jpeg;base64,${frame.image_base64}`}
+                                            src={`${API_BASE_URL}${frame.url}`}
                                             alt={`Alternative at ${frame.timestamp}`}
                                         />
                                         <div className="frame-timestamp">{frame.timestamp}</div>
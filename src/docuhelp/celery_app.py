@@ -0,0 +1,54 @@
+"""
+Celery application for running VLM inference outside the API process.
+
+Inference takes 30+ seconds per video, so it runs on dedicated workers that
+scale independently of the API replicas:
+
+    celery -A docuhelp.celery_app worker -Q vlm_queue --concurrency=<n_gpus>
+
+Celery is optional; when it is not installed or CELERY_BROKER_URL is unset,
+`celery_app` is None and the API falls back to in-process background tasks.
+"""
+import logging
+import os
+
+from dotenv import load_dotenv
+
+try:
+    from celery import Celery
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Read .env here as well, since workers never import the API entrypoint
+load_dotenv()
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+VLM_QUEUE = "vlm_queue"
+VLM_TASK_TIME_LIMIT = 1800
+
+celery_app = None
+process_video_task = None
+
+if CELERY_AVAILABLE and CELERY_BROKER_URL:
+    celery_app = Celery("docuhelp", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
+    celery_app.conf.update(
+        # One long GPU task at a time per worker process
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+        task_time_limit=VLM_TASK_TIME_LIMIT,
+        task_routes={"vlm.process": {"queue": VLM_QUEUE}},
+    )
+
+    @celery_app.task(name="vlm.process")
+    def process_video_task(video_id: str):
+        """Run VLM inference for an uploaded video on a Celery worker."""
+        # Import here to avoid circular imports with the API routes
+        from docuhelp.ui.api.routes.video import process_video_with_vlm
+
+        process_video_with_vlm(video_id)
+elif CELERY_BROKER_URL:
+    logger.warning("CELERY_BROKER_URL is set but celery is not installed; VLM tasks will run in-process")
@@ -1,18 +1,183 @@
 """Data loader utilities."""
 from pathlib import Path
 from typing import List, Dict, Optional, BinaryIO
+import errno
+import io
+import itertools
+import os
+import stat
+import sys
 import tempfile
 import shutil
-import mimetypes
 from datetime import datetime
+from functools import lru_cache
 
 
-VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'}
+VIDEO_EXTENSIONS = frozenset(
+    sys.intern(ext) for ext in ('.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v')
+)
+
+# Static MIME lookup for VIDEO_EXTENSIONS; avoids initialising the mimetypes DB
+_EXT_TO_MIME = {
+    '.mp4': 'video/mp4',
+    '.webm': 'video/webm',
+    '.mov': 'video/quicktime',
+    '.mkv': 'video/x-matroska',
+    '.avi': 'video/x-msvideo',
+    '.wmv': 'video/x-ms-wmv',
+    '.flv': 'video/x-flv',
+    '.m4v': 'video/x-m4v',
+}
+
+# Uploads are staged here; created once rather than probed on every upload
+_TEMP_DIR = Path(tempfile.gettempdir()) / "docuhelp_videos"
+_TEMP_DIR.mkdir(exist_ok=True)
+
+# Characters replaced in uploaded filename stems (separators, NUL, controls, ...)
+_UNSAFE_FILENAME_CHARS = str.maketrans({c: '_' for c in '\x00/\\:*?"<>|\r\n\t'})
+
+# Longest stem kept from an uploaded filename
+_MAX_STEM_LENGTH = 128
+
+# Format of the timestamp prefixed to uploaded filenames
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Largest chunk handed to a single os.sendfile() call
+_SENDFILE_CHUNK = 1 << 30
+
+# Read/write size for the buffered fallback copy (shutil defaults to 64 KiB)
+_COPY_BUFSIZE = 1024 * 1024
+
+
+class _GiveupOnFastCopyError(Exception):
+    """Raised when the zero-copy path can't be used and we must fall back."""
+
+
+def _sendfile_copy(src: BinaryIO, dst_fd: int) -> int:
+    """
+    Copy `src` into `dst_fd` with os.sendfile so data never leaves the kernel.
+
+    Args:
+        src: Source file object backed by a real file descriptor
+        dst_fd: Destination file descriptor opened for writing
+
+    Returns:
+        Number of bytes copied
+
+    Raises:
+        _GiveupOnFastCopyError: If the source has no usable descriptor or the
+            platform rejects sendfile for this pair of files
+    """
+    if not hasattr(os, 'sendfile') or not hasattr(src, 'fileno'):
+        raise _GiveupOnFastCopyError()
+
+    # Asking an in-memory SpooledTemporaryFile for its fileno() would force
+    # it to roll over to disk first, which costs more than it saves.
+    if not getattr(src, '_rolled', True):
+        raise _GiveupOnFastCopyError()
+
+    try:
+        src_fd = src.fileno()
+        os.fstat(src_fd)
+    except (AttributeError, OSError, io.UnsupportedOperation, ValueError) as e:
+        raise _GiveupOnFastCopyError() from e
+
+    # Honour the logical position of buffered readers rather than the raw fd's
+    offset = src.tell() if hasattr(src, 'tell') else 0
+    copied = 0
+    while True:
+        try:
+            sent = os.sendfile(dst_fd, src_fd, offset + copied, _SENDFILE_CHUNK)
+        except OSError as e:
+            # Non-regular source (pipe, socket, ...) or unsupported filesystem:
+            # only safe to fall back if nothing has been written yet.
+            if copied == 0 and e.errno in (errno.EINVAL, errno.ENOTSOCK, errno.ENOSYS,
+                                           errno.EOPNOTSUPP, errno.EBADF):
+                raise _GiveupOnFastCopyError() from e
+            raise
+        if sent == 0:
+            break
+        copied += sent
+
+    if hasattr(src, 'seek'):
+        src.seek(offset + copied)
+    return copied
+
+
+class _CountingWriter:
+    """Write-through wrapper that tallies the bytes passed to `write`."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.n = 0
+
+    def write(self, b) -> int:
+        self.n += len(b)
+        return self.f.write(b)
+
+
+def _readinto_copy(src: BinaryIO, dst: BinaryIO) -> int:
+    """
+    Copy `src` into `dst` through one reusable buffer.
+
+    Unlike shutil.copyfileobj this allocates no bytes object per chunk; each
+    read lands directly in the same bytearray and is written from a view.
+
+    Args:
+        src: Source file object supporting readinto()
+        dst: Destination file object opened for writing
+
+    Returns:
+        Number of bytes copied
+    """
+    copied = 0
+    with memoryview(bytearray(_COPY_BUFSIZE)) as mv:
+        while n := src.readinto(mv):
+            chunk = mv[:n] if n < len(mv) else mv
+            # Raw file objects may accept only part of a write
+            while chunk:
+                written = dst.write(chunk)
+                chunk = chunk[written:]
+            copied += n
+    return copied
+
+
+def _ext(name: str) -> str:
+    """Lower-cased extension of `name` (like Path.suffix, but without a Path)."""
+    i = name.rfind('.')
+    # i == 0 is a dotfile such as '.mp4', which Path.suffix treats as no suffix
+    return name[i:].lower() if i > 0 else ''
 
 
 def list_videos(folder: Path) -> List[Path]:
     """Return a list of video files in `folder`."""
-    return [p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS]
+    videos = []
+    # DirEntry carries the cached d_type, so is_file() needs no extra stat()
+    with os.scandir(folder) as it:
+        for entry in it:
+            if _ext(entry.name) in VIDEO_EXTENSIONS and entry.is_file():
+                videos.append(Path(entry.path))
+    return videos
+
+
+def _create_exclusive(base: str, extension: str):
+    """
+    Create `{base}{extension}` in the staging directory without overwriting.
+
+    The file is opened with O_EXCL, so concurrent uploads of the same name in
+    the same second can't collide; only then is a counter appended
+    (`{base}_1{extension}`, `{base}_2{extension}`, ...).
+
+    Returns:
+        Tuple of (open file descriptor, path)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for n in itertools.count():
+        path = _TEMP_DIR / (f"{base}{extension}" if n == 0 else f"{base}_{n}{extension}")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
 
 
 def parse_video_from_upload(
@@ -39,7 +204,7 @@ def parse_video_from_upload(
             - timestamp: Upload timestamp
     """
     # Validate file type
-    extension = Path(filename).suffix.lower()
+    extension = _ext(filename)
     if extension not in VIDEO_EXTENSIONS:
         raise ValueError(
             f"Invalid video format: {extension}. "
@@ -47,24 +212,34 @@ def parse_video_from_upload(
         )
 
     # Determine MIME type
-    mime_type, _ = mimetypes.guess_type(filename)
-    if not mime_type:
-        mime_type = 'video/mp4'  # Default fallback
-
-    # Create temporary file
-    temp_dir = Path(tempfile.gettempdir()) / "docuhelp_videos"
-    temp_dir.mkdir(exist_ok=True)
+    mime_type = _EXT_TO_MIME.get(extension, 'video/mp4')
 
     # Generate unique filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"{timestamp}_{Path(filename).stem}{extension}"
-    temp_path = temp_dir / safe_filename
+    now = datetime.now()
+    timestamp = now.strftime(_TIMESTAMP_FORMAT)
+    stem = Path(filename).stem.translate(_UNSAFE_FILENAME_CHARS)[:_MAX_STEM_LENGTH]
+    base = f"{timestamp}_{stem}"
+    try:
+        dst_fd, temp_path = _create_exclusive(base, extension)
+    except FileNotFoundError:
+        # Staging directory was removed (e.g. by a tmp cleaner) since import
+        _TEMP_DIR.mkdir(exist_ok=True)
+        dst_fd, temp_path = _create_exclusive(base, extension)
+    safe_filename = temp_path.name
 
-    # Save file to temporary location
-    file_size = 0
-    with open(temp_path, 'wb') as f:
-        shutil.copyfileobj(file_content, f)
-        file_size = temp_path.stat().st_size
+    # Save file to temporary location, zero-copy when the source is a real file
+    # Unbuffered: the copy already moves data in large chunks
+    with open(dst_fd, 'wb', buffering=0) as f:
+        try:
+            file_size = _sendfile_copy(file_content, dst_fd)
+        except _GiveupOnFastCopyError:
+            if hasattr(file_content, 'readinto'):
+                file_size = _readinto_copy(file_content, f)
+            else:
+                # e.g. some WSGI input streams only implement read()
+                counter = _CountingWriter(f)
+                shutil.copyfileobj(file_content, counter, length=_COPY_BUFSIZE)
+                file_size = counter.n
 
     return {
         'temp_path': str(temp_path),
@@ -75,34 +250,47 @@ def parse_video_from_upload(
         'extension': extension,
         'metadata': metadata or {},
         'timestamp': timestamp,
-        'upload_time': datetime.now().isoformat()
+        'upload_time': now.isoformat()
     }
 
 
-def validate_video_file(file_path: Path) -> bool:
+@lru_cache(maxsize=1024)
+def _validate_cached(path_str: str, mtime_ns: int, size: int, mode: int) -> bool:
+    """Validation verdict for one version of a file, keyed by its stat identity."""
+    if not stat.S_ISREG(mode):
+        return False
+
+    if _ext(Path(path_str).name) not in VIDEO_EXTENSIONS:
+        return False
+
+    # Check if file is not empty
+    if size == 0:
+        return False
+
+    return True
+
+
+def validate_video_file(file_path: Path, st: Optional[os.stat_result] = None) -> bool:
     """
     Validate that a video file exists and is readable.
 
+    Results are cached per (path, mtime, size), so re-validating an
+    unchanged file costs a single stat.
+
     Args:
         file_path: Path to video file
+        st: Result of a previous os.stat(file_path), to avoid stat-ing again
 
     Returns:
         True if valid, False otherwise
     """
-    if not file_path.exists():
-        return False
+    if st is None:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
 
-    if not file_path.is_file():
-        return False
-
-    if file_path.suffix.lower() not in VIDEO_EXTENSIONS:
-        return False
-
-    # Check if file is not empty
-    if file_path.stat().st_size == 0:
-        return False
-
-    return True
+    return _validate_cached(str(file_path), st.st_mtime_ns, st.st_size, st.st_mode)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,40 @@
 """Unified video input parser supporting both file uploads and YouTube URLs."""
-from typing import Dict, Optional, BinaryIO, Union
+from typing import Dict, List, Optional, BinaryIO, Required, TypedDict, Union
 from pathlib import Path
 from enum import Enum
+import json
 import logging
+import os
+import re
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from docuhelp.dataset.loader import parse_video_from_upload, validate_video_file
-from docuhelp.dataset.youtube_parser import YouTubeParser, parse_youtube_url
 
 logger = logging.getLogger(__name__)
 
+# Cheap pre-filter so local paths don't go through the full video-ID extractor
+_YT_HINT = re.compile(r"(?:youtu\.be|youtube\.com)", re.IGNORECASE)
+
+# A bare YouTube video ID, which the extractor also accepts
+_BARE_VIDEO_ID = re.compile(r"[A-Za-z0-9_-]{11}")
+
+# Longer strings can't be a local path, so reject them before stat-ing
+try:
+    _PATH_MAX = os.pathconf('/', 'PC_PATH_MAX')
+except (AttributeError, OSError, ValueError):
+    _PATH_MAX = 4096
+
 
 class VideoInputType(Enum):
     """Types of video input sources."""
@@ -17,11 +43,68 @@ class VideoInputType(Enum):
     LOCAL_FILE = "local_file"
 
 
+class ParsedVideo(TypedDict, total=False):
+    """
+    Result of parsing any video input.
+
+    A plain dict at runtime, so results can be subscripted, updated and
+    passed to json.dumps. Keys that don't apply to the input type are absent.
+    """
+    input_type: Required[str]
+    video_data: Required[Dict]
+    metadata: Required[Dict]
+    source: Required[str]
+    filename: str
+    file_path: str
+    file_size: int
+    mime_type: str
+    video_id: str
+    title: str
+    duration: int
+    has_subtitles: bool
+    timestamps: List[Dict]
+
+
+def to_json(parsed: ParsedVideo) -> bytes:
+    """
+    Encode a parsed video as UTF-8 JSON for over-the-wire callers.
+
+    Uses msgspec or orjson when installed (the 'speedups' extra), which
+    encode the dict in C, and falls back to the standard json module.
+
+    Args:
+        parsed: Result of VideoInputParser.parse_input
+
+    Returns:
+        JSON-encoded bytes
+    """
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.encode(parsed)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(parsed)
+    return json.dumps(parsed, ensure_ascii=False).encode('utf-8')
+
+
 class VideoInputParser:
     """Unified parser for all types of video inputs."""
 
     def __init__(self):
-        self.youtube_parser = YouTubeParser()
+        # Created on first YouTube use; importing youtube_parser pulls in
+        # pytubefix and youtube-transcript-api
+        self._youtube_parser = None
+        self._dispatch = {
+            VideoInputType.YOUTUBE_URL: self._parse_youtube_input,
+            VideoInputType.FILE_UPLOAD: self._parse_file_upload,
+            VideoInputType.LOCAL_FILE: self._parse_local_file,
+        }
+
+    @property
+    def youtube_parser(self):
+        """YouTubeParser instance, imported and created on first access."""
+        if self._youtube_parser is None:
+            from docuhelp.dataset.youtube_parser import YouTubeParser
+            self._youtube_parser = YouTubeParser()
+        return self._youtube_parser
 
     def detect_input_type(self, input_data: Union[str, BinaryIO]) -> VideoInputType:
         """
@@ -35,15 +118,24 @@ class VideoInputParser:
         """
         if isinstance(input_data, str):
             # Check if it's a YouTube URL
-            video_id = self.youtube_parser.extract_video_id(input_data)
-            if video_id:
+            if _YT_HINT.search(input_data) and self.youtube_parser.extract_video_id(input_data):
                 return VideoInputType.YOUTUBE_URL
 
+            # Any other URL or an over-long string can't be a local file path
+            if "://" in input_data:
+                raise ValueError(f"Unrecognised URL scheme: {input_data[:80]}")
+            if len(input_data) > _PATH_MAX:
+                raise ValueError(f"Invalid input: path longer than {_PATH_MAX} characters")
+
             # Check if it's a local file path
             file_path = Path(input_data)
             if file_path.exists() and file_path.is_file():
                 return VideoInputType.LOCAL_FILE
 
+            # Only a string that isn't a local file can be a bare video ID
+            if _BARE_VIDEO_ID.fullmatch(input_data):
+                return VideoInputType.YOUTUBE_URL
+
             raise ValueError(f"Invalid input: {input_data}")
 
         else:
@@ -58,7 +150,7 @@ class VideoInputParser:
         extract_youtube_subtitles: bool = True,
         use_oauth: bool = False,
         allow_oauth_cache: bool = True
-    ) -> Dict:
+    ) -> ParsedVideo:
         """
         Parse any type of video input and return unified data structure.
 
@@ -71,114 +163,118 @@ class VideoInputParser:
             allow_oauth_cache: Allow caching of OAuth credentials
 
         Returns:
-            Unified video data dictionary:
-            {
-                'input_type': 'file_upload' | 'youtube_url' | 'local_file',
-                'video_data': {...},  # Type-specific data
-                'metadata': {...},
-                'parsed_at': '...'
-            }
+            ParsedVideo with:
+                input_type: 'file_upload' | 'youtube_url' | 'local_file'
+                video_data: Type-specific data dict
+                metadata: Additional metadata
+                plus the source-specific fields (video_id, file_path, ...)
         """
         input_type = self.detect_input_type(input_data)
-
-        if input_type == VideoInputType.YOUTUBE_URL:
-            return self._parse_youtube_input(
-                input_data,
-                metadata,
-                extract_youtube_subtitles,
-                use_oauth,
-                allow_oauth_cache
-            )
-
-        elif input_type == VideoInputType.FILE_UPLOAD:
-            if not filename:
-                raise ValueError("Filename is required for file uploads")
-            return self._parse_file_upload(input_data, filename, metadata)
-
-        elif input_type == VideoInputType.LOCAL_FILE:
-            return self._parse_local_file(input_data, metadata)
-
-        else:
-            raise ValueError(f"Unsupported input type: {input_type}")
+        return self._dispatch[input_type](
+            input_data,
+            filename,
+            metadata,
+            extract_youtube_subtitles=extract_youtube_subtitles,
+            use_oauth=use_oauth,
+            allow_oauth_cache=allow_oauth_cache
+        )
 
     def _parse_youtube_input(
         self,
         url: str,
+        filename: Optional[str],
         metadata: Optional[Dict],
-        extract_subtitles: bool,
+        extract_youtube_subtitles: bool = True,
         use_oauth: bool = False,
         allow_oauth_cache: bool = True
-    ) -> Dict:
+    ) -> ParsedVideo:
         """Parse YouTube URL input."""
+        from docuhelp.dataset.youtube_parser import parse_youtube_url
+
         logger.info(f"Parsing YouTube URL: {url}")
 
         youtube_data = parse_youtube_url(
             url,
-            extract_subtitles=extract_subtitles,
+            extract_subtitles=extract_youtube_subtitles,
             use_oauth=use_oauth,
             allow_oauth_cache=allow_oauth_cache
         )
 
-        return {
-            'input_type': VideoInputType.YOUTUBE_URL.value,
-            'video_data': youtube_data,
-            'metadata': metadata or {},
-            'source': 'youtube',
-            'video_id': youtube_data['video_id'],
-            'title': youtube_data['metadata']['title'],
-            'duration': youtube_data['metadata']['length'],
-            'has_subtitles': youtube_data['has_subtitles'],
-            'timestamps': youtube_data['description_timestamps'],
-        }
+        return ParsedVideo(
+            input_type=VideoInputType.YOUTUBE_URL.value,
+            video_data=youtube_data,
+            metadata=metadata or {},
+            source='youtube',
+            video_id=youtube_data['video_id'],
+            title=youtube_data['metadata']['title'],
+            duration=youtube_data['metadata']['length'],
+            has_subtitles=youtube_data['has_subtitles'],
+            timestamps=youtube_data['description_timestamps'],
+        )
 
     def _parse_file_upload(
         self,
         file_content: BinaryIO,
-        filename: str,
-        metadata: Optional[Dict]
-    ) -> Dict:
+        filename: Optional[str],
+        metadata: Optional[Dict],
+        **kwargs
+    ) -> ParsedVideo:
         """Parse uploaded file."""
+        if not filename:
+            raise ValueError("Filename is required for file uploads")
+
         logger.info(f"Parsing file upload: {filename}")
 
         file_data = parse_video_from_upload(file_content, filename, metadata)
 
-        return {
-            'input_type': VideoInputType.FILE_UPLOAD.value,
-            'video_data': file_data,
-            'metadata': metadata or {},
-            'source': 'upload',
-            'filename': file_data['filename'],
-            'file_path': file_data['temp_path'],
-            'file_size': file_data['file_size'],
-            'mime_type': file_data['mime_type'],
-        }
+        return ParsedVideo(
+            input_type=VideoInputType.FILE_UPLOAD.value,
+            video_data=file_data,
+            metadata=metadata or {},
+            source='upload',
+            filename=file_data['filename'],
+            file_path=file_data['temp_path'],
+            file_size=file_data['file_size'],
+            mime_type=file_data['mime_type'],
+        )
 
     def _parse_local_file(
         self,
         file_path: str,
-        metadata: Optional[Dict]
-    ) -> Dict:
+        filename: Optional[str],
+        metadata: Optional[Dict],
+        **kwargs
+    ) -> ParsedVideo:
         """Parse local file path."""
         logger.info(f"Parsing local file: {file_path}")
 
         path = Path(file_path)
-        if not validate_video_file(path):
+        # One stat serves both validation and the reported size
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise ValueError(f"Invalid video file: {file_path}")
+        if not validate_video_file(path, st):
             raise ValueError(f"Invalid video file: {file_path}")
 
-        return {
-            'input_type': VideoInputType.LOCAL_FILE.value,
-            'video_data': {
+        return ParsedVideo(
+            input_type=VideoInputType.LOCAL_FILE.value,
+            video_data={
                 'file_path': str(path),
                 'filename': path.name,
-                'file_size': path.stat().st_size,
+                'file_size': st.st_size,
                 'extension': path.suffix,
             },
-            'metadata': metadata or {},
-            'source': 'local',
-            'filename': path.name,
-            'file_path': str(path),
-            'file_size': path.stat().st_size,
-        }
+            metadata=metadata or {},
+            source='local',
+            filename=path.name,
+            file_path=str(path),
+            file_size=st.st_size,
+        )
+
+
+# Shared parser for parse_video_input(); VideoInputParser holds no per-call state
+_default_parser: Optional[VideoInputParser] = None
 
 
 def parse_video_input(
@@ -188,7 +284,7 @@ def parse_video_input(
     extract_youtube_subtitles: bool = True,
     use_oauth: bool = False,
     allow_oauth_cache: bool = True
-) -> Dict:
+) -> ParsedVideo:
     """
     Convenience function to parse any video input.
 
@@ -201,10 +297,12 @@ def parse_video_input(
         allow_oauth_cache: Allow caching of OAuth credentials
 
     Returns:
-        Parsed video data dictionary
+        ParsedVideo describing the input
     """
-    parser = VideoInputParser()
-    return parser.parse_input(
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = VideoInputParser()
+    return _default_parser.parse_input(
         input_data,
         filename,
         metadata,
@@ -1,10 +1,20 @@
 """YouTube video downloader with metadata storage using yt-dlp."""
-from typing import Dict, Optional, List, Callable
+from typing import Dict, Optional, List, Callable, Literal, Iterator
 from pathlib import Path
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextlib
+import functools
+import itertools
 import json
 import logging
-from datetime import datetime
+import os
 import re
+import shutil
+import threading
+import time
+from types import MappingProxyType
 
 try:
     import yt_dlp
@@ -12,10 +22,295 @@ try:
 except ImportError:
     YT_DLP_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from aiofile import AIOFile
+    AIOFILE_AVAILABLE = True
+except ImportError:
+    AIOFILE_AVAILABLE = False
+
 from docuhelp.dataset.youtube_parser import YouTubeParser
 
 logger = logging.getLogger(__name__)
 
+# yt-dlp options shared by every video download
+_BASE_YDL_OPTS = MappingProxyType({
+    'writeinfojson': True,  # Save yt-dlp's own metadata
+    'writethumbnail': True,  # Download thumbnail
+    'writedescription': True,  # Save description
+    'quiet': False,
+    'no_warnings': False,
+})
+
+# yt-dlp options for listing playlist entries without downloading them
+_PLAYLIST_YDL_OPTS = MappingProxyType({
+    'quiet': True,
+    'lazy_playlist': True,
+    'skip_download': True,
+})
+
+# Unprocessed result types that point at another URL, and those holding entries
+_URL_RESULT_TYPES = frozenset({'url', 'url_transparent'})
+_PLAYLIST_RESULT_TYPES = frozenset({'playlist', 'multi_video'})
+# Extractions allowed while following redirects and nested playlists (channel tabs)
+_MAX_PLAYLIST_DEPTH = 3
+
+
+def _height_format(height) -> str:
+    """Build a yt-dlp format selector capped at the given video height."""
+    return f'bestvideo[height<={height}]+bestaudio/best[height<={height}]'
+
+
+# Format selectors for named and common height-based qualities (e.g. '720p')
+_QUALITY_FORMATS = {
+    'best': 'bestvideo+bestaudio/best',
+    'worst': 'worstvideo+worstaudio/worst',
+}
+_HEIGHT_FORMATS = {
+    f'{h}p': _height_format(h) for h in (144, 240, 360, 480, 720, 1080, 1440, 2160)
+}
+
+# Browsers tried, in order, for cookies when a video turns out to be age-restricted
+_BROWSER_CANDIDATES = ('chrome', 'firefox', 'edge', 'brave', 'safari')
+
+# Characters not allowed in filenames on common filesystems, and whitespace runs
+_INVALID_FN_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+_WS_RUN = re.compile(r'\s+')
+
+# Minimum seconds between "Downloading: x%" progress log lines
+PROGRESS_LOG_INTERVAL = 0.5
+
+# Idle YoutubeDL instances kept per downloader for reuse across downloads
+YDL_POOL_SIZE = 4
+
+def _freeze(value):
+    """Recursively convert yt-dlp options into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+_JSON_WRITE_BUFFER = 1024 * 1024
+_JSON_SCALARS = (int, float, str, bool, type(None))
+
+
+def _write_json(path: Path, data, default: Optional[Callable] = None):
+    """
+    Write data to path as indented UTF-8 JSON, using orjson when available.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable object
+        default: Fallback serializer for unsupported types (e.g. str)
+    """
+    if ORJSON_AVAILABLE:
+        path.write_bytes(_dumps_json(data, default))
+        return
+
+    # json.dump emits many small chunks; a large buffer coalesces them
+    with open(path, 'w', encoding='utf-8', buffering=_JSON_WRITE_BUFFER) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=default)
+
+
+def _dumps_json(data, default: Optional[Callable] = None) -> bytes:
+    """Serialize data to indented UTF-8 JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            default=default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, default=default).encode('utf-8')
+
+
+async def _write_json_async(path: Path, data, default: Optional[Callable] = None):
+    """
+    Asynchronously write data to path as indented UTF-8 JSON.
+
+    Uses aiofile (kernel AIO where supported) when available, otherwise
+    runs _write_json in a worker thread.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable object
+        default: Fallback serializer for unsupported types (e.g. str)
+    """
+    if not AIOFILE_AVAILABLE:
+        await asyncio.to_thread(_write_json, path, data, default)
+        return
+
+    payload = _dumps_json(data, default)
+    async with AIOFile(str(path), 'wb') as afp:
+        await afp.write(payload)
+
+
+def _entry_url(entry: Dict) -> str:
+    """
+    Build the watch URL for an unprocessed playlist entry.
+
+    Args:
+        entry: Playlist entry from extract_info(..., process=False)
+
+    Returns:
+        Video URL, from the entry's ID or its own 'url' field
+    """
+    video_id = entry.get('id')
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return entry['url']
+
+
+def _is_video_entry(entry: Dict) -> bool:
+    """Check whether an unprocessed extract_info result refers to a single video."""
+    entry_type = entry.get('_type', 'video')
+    if entry_type in _URL_RESULT_TYPES:
+        return entry.get('ie_key') == 'Youtube'
+    return entry_type == 'video'
+
+
+def _resolve_url_result(ydl, info: Dict, depth: int):
+    """
+    Follow 'url'/'url_transparent' results until something concrete comes back.
+
+    Args:
+        ydl: YoutubeDL instance used for the extra extractions
+        info: Unprocessed extract_info result
+        depth: Extractions already spent on this branch
+
+    Returns:
+        Tuple of (resolved info, extractions spent so far)
+    """
+    while info.get('_type') in _URL_RESULT_TYPES and depth < _MAX_PLAYLIST_DEPTH:
+        info = ydl.extract_info(
+            info['url'], download=False, process=False, ie_key=info.get('ie_key')
+        )
+        depth += 1
+    return info, depth
+
+
+def _walk_playlist_entries(ydl, entries, depth: int, seen: set) -> Iterator[Dict]:
+    """Yield video entries, descending into nested playlists and skipping duplicates."""
+    for entry in entries:
+        if not entry:
+            continue
+        if not _is_video_entry(entry):
+            try:
+                entry, entry_depth = _resolve_url_result(ydl, entry, depth)
+            except Exception as e:
+                logger.warning(f"Skipping playlist entry {entry.get('url')}: {e}")
+                continue
+            if entry.get('_type') in _PLAYLIST_RESULT_TYPES:
+                if entry_depth < _MAX_PLAYLIST_DEPTH:
+                    yield from _walk_playlist_entries(ydl, entry['entries'], entry_depth + 1, seen)
+                continue
+            if not _is_video_entry(entry):
+                continue
+
+        key = entry.get('id') or entry.get('url')
+        if key in seen:
+            continue
+        seen.add(key)
+        yield entry
+
+
+def _iter_playlist_videos(ydl, playlist_url: str) -> Iterator[Dict]:
+    """
+    Lazily list the videos of a playlist, channel or watch-with-list URL.
+
+    The top-level result of extract_info(..., process=False) may itself be a
+    URL result (e.g. watch?v=...&list=... or a channel URL), and its entries
+    may be nested playlists such as channel tabs; both are resolved here.
+
+    Args:
+        ydl: YoutubeDL instance created with _PLAYLIST_YDL_OPTS
+        playlist_url: Playlist, channel or watch URL with a list parameter
+
+    Yields:
+        Flat video entries suitable for download_video(preextracted_info=...)
+
+    Raises:
+        ValueError: If the URL does not resolve to a playlist
+    """
+    info = ydl.extract_info(playlist_url, download=False, process=False)
+    info, depth = _resolve_url_result(ydl, info, 0)
+    if info.get('_type') not in _PLAYLIST_RESULT_TYPES:
+        raise ValueError("Not a valid playlist URL")
+    yield from _walk_playlist_entries(ydl, info['entries'], depth, set())
+
+
+def _scan_aux_files(video_dir: Path, filename: str) -> Dict:
+    """
+    Find the files yt-dlp wrote alongside a video in one directory pass.
+
+    Args:
+        video_dir: Directory the video was downloaded into
+        filename: Sanitized base filename (without extension)
+
+    Returns:
+        Dictionary with 'subtitle_paths' (VTT files first, then SRT) and the
+        'thumbnail_path', 'description_path' and 'info_json_path' (or None)
+    """
+    vtt_paths, srt_paths = [], []
+    aux = {'thumbnail_path': None, 'description_path': None, 'info_json_path': None}
+    exact = {
+        f"{filename}.jpg": 'thumbnail_path',
+        f"{filename}.description": 'description_path',
+        f"{filename}.info.json": 'info_json_path',
+    }
+
+    with os.scandir(video_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith(filename):
+                continue
+            if name.endswith('.vtt'):
+                vtt_paths.append(entry.path)
+            elif name.endswith('.srt'):
+                srt_paths.append(entry.path)
+            elif name in exact:
+                aux[exact[name]] = entry.path
+
+    aux['subtitle_paths'] = vtt_paths + srt_paths
+    return aux
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_available() -> bool:
+    """
+    Check once per interpreter whether FFmpeg is on PATH.
+
+    Uses shutil.which rather than running `ffmpeg -version`, so no process is
+    spawned, and the warning is only logged the first time.
+
+    Returns:
+        True if FFmpeg is available, False otherwise
+    """
+    if shutil.which('ffmpeg'):
+        logger.info("FFmpeg is installed and available")
+        return True
+
+    logger.warning(
+        "\n" + "=" * 70 + "\n"
+        "WARNING: FFmpeg not found!\n"
+        "=" * 70 + "\n"
+        "FFmpeg is REQUIRED for downloading and merging video/audio.\n"
+        "Without it, downloads will fail or produce unplayable files.\n\n"
+        "Install FFmpeg:\n"
+        "  Windows (Chocolatey): choco install ffmpeg\n"
+        "  Windows (Manual): https://www.gyan.dev/ffmpeg/builds/\n"
+        "  Linux: sudo apt install ffmpeg\n"
+        "  Mac: brew install ffmpeg\n"
+        + "=" * 70
+    )
+    return False
+
 
 class YouTubeDownloader:
     """Download YouTube videos and store metadata."""
@@ -34,7 +329,12 @@ class YouTubeDownloader:
 
         self.download_dir = download_dir or Path("downloads/youtube")
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        # Idle YoutubeDL instances as (options key, instance); each is used by one download at a time
+        self._ydl_pool = deque()
+        self._ydl_pool_lock = threading.Lock()
         self.parser = YouTubeParser()
+        # Time of the last progress log line per video, so concurrent downloads throttle independently
+        self._last_log_ts: Dict[str, float] = {}
         self._check_ffmpeg()
 
     def _check_ffmpeg(self) -> bool:
@@ -44,31 +344,143 @@ class YouTubeDownloader:
         Returns:
             True if FFmpeg is available, False otherwise
         """
-        import subprocess
+        return _ffmpeg_available()
+
+    @contextlib.contextmanager
+    def _pooled_ydl(self, ydl_opts: Dict):
+        """
+        Check out a YoutubeDL for these options from the idle pool.
+
+        Building a YoutubeDL loads every extractor, reads browser cookies and
+        opens a fresh HTTP session. Only the output template differs between
+        videos of a playlist, so idle instances are matched on the remaining
+        options and just retargeted. At most YDL_POOL_SIZE instances are kept;
+        the least recently used one is closed when the pool overflows.
+
+        Args:
+            ydl_opts: yt-dlp options for this download
+
+        Yields:
+            YoutubeDL instance configured with `ydl_opts`
+        """
+        key = _freeze({k: v for k, v in ydl_opts.items() if k != 'outtmpl'})
+        ydl = None
+        with self._ydl_pool_lock:
+            for entry in self._ydl_pool:
+                if entry[0] == key:
+                    self._ydl_pool.remove(entry)
+                    ydl = entry[1]
+                    break
+
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(ydl_opts)
+        else:
+            outtmpl = ydl_opts['outtmpl']
+            if not isinstance(outtmpl, dict):
+                outtmpl = {'default': outtmpl}
+            ydl.params['outtmpl'] = {**ydl.params.get('outtmpl', {}), **outtmpl}
+
         try:
-            subprocess.run(
-                ['ffmpeg', '-version'],
-                capture_output=True,
-                check=True,
-                timeout=5
-            )
-            logger.info("FFmpeg is installed and available")
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            logger.warning(
-                "\n" + "=" * 70 + "\n"
-                "WARNING: FFmpeg not found!\n"
-                "=" * 70 + "\n"
-                "FFmpeg is REQUIRED for downloading and merging video/audio.\n"
-                "Without it, downloads will fail or produce unplayable files.\n\n"
-                "Install FFmpeg:\n"
-                "  Windows (Chocolatey): choco install ffmpeg\n"
-                "  Windows (Manual): https://www.gyan.dev/ffmpeg/builds/\n"
-                "  Linux: sudo apt install ffmpeg\n"
-                "  Mac: brew install ffmpeg\n"
-                + "=" * 70
-            )
-            return False
+            yield ydl
+        finally:
+            evicted = None
+            with self._ydl_pool_lock:
+                self._ydl_pool.append((key, ydl))
+                if len(self._ydl_pool) > YDL_POOL_SIZE:
+                    evicted = self._ydl_pool.popleft()[1]
+            if evicted is not None:
+                evicted.close()
+
+    def close(self) -> None:
+        """Close the idle YoutubeDL instances kept for reuse."""
+        with self._ydl_pool_lock:
+            idle = [ydl for _, ydl in self._ydl_pool]
+            self._ydl_pool.clear()
+        for ydl in idle:
+            ydl.close()
+
+    def _run_ytdlp(self, ydl_opts: Dict, url: str) -> Dict:
+        """
+        Download `url` with yt-dlp.
+
+        Args:
+            ydl_opts: yt-dlp options
+            url: YouTube URL
+
+        Returns:
+            yt-dlp info dict for the downloaded video
+        """
+        logger.info(f"Downloading video from: {url}")
+        if 'cookiefile' in ydl_opts:
+            # yt-dlp writes the cookie jar back on close, so don't keep it open
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                return ydl.extract_info(url, download=True)
+        with self._pooled_ydl(ydl_opts) as ydl:
+            return ydl.extract_info(url, download=True)
+
+    def _find_cookie_browser(self, url: str) -> Optional[str]:
+        """
+        Find a browser whose cookies can access `url`.
+
+        Each candidate is tried with a metadata-only request, so a failing
+        cookie source costs one round trip rather than a full download.
+
+        Args:
+            url: YouTube URL
+
+        Returns:
+            Name of the first working browser, or None if none worked
+        """
+        for browser in _BROWSER_CANDIDATES:
+            probe_opts = {
+                'cookiesfrombrowser': (browser,),
+                'quiet': True,
+                'no_warnings': True,
+                'skip_download': True,
+            }
+            try:
+                with yt_dlp.YoutubeDL(probe_opts) as ydl:
+                    ydl.extract_info(url, download=False)
+            except Exception as e:
+                logger.debug(f"Cookies from {browser} did not work: {e}")
+                continue
+            logger.info(f"Using cookies from browser: {browser}")
+            return browser
+        return None
+
+    def _metadata_from_entry(self, entry: Dict, video_id: str) -> Dict:
+        """
+        Build download metadata from a flat yt-dlp playlist entry.
+
+        Mirrors the shape of YouTubeParser.parse_youtube_video() for the fields
+        a flat entry carries, so no extra metadata request is needed.
+
+        Args:
+            entry: Flat yt-dlp entry
+            video_id: YouTube video ID
+
+        Returns:
+            Metadata dictionary
+        """
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        return {
+            'video_id': video_id,
+            'url': url,
+            'metadata': {
+                'video_id': video_id,
+                'title': entry.get('title') or video_id,
+                'author': entry.get('uploader') or entry.get('channel'),
+                'length': entry.get('duration'),
+                'description': entry.get('description'),
+                'views': entry.get('view_count'),
+                'url': url,
+            },
+            'description_timestamps': [],
+            'subtitles': {},
+            'has_subtitles': False,
+            'subtitle_languages': [],
+            'parsed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
 
     def _sanitize_filename(self, filename: str) -> str:
         """
@@ -80,13 +492,10 @@ class YouTubeDownloader:
         Returns:
             Sanitized filename
         """
-        # Remove invalid characters
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-        # Replace multiple spaces with single space
-        filename = re.sub(r'\s+', ' ', filename)
+        # Remove invalid characters, then collapse whitespace runs
+        filename = _WS_RUN.sub(' ', filename.translate(_INVALID_FN_CHARS))
         # Trim and limit length
-        filename = filename.strip()[:200]
-        return filename
+        return filename.strip()[:200]
 
     def _progress_hook(self, d: Dict) -> None:
         """
@@ -96,6 +505,15 @@ class YouTubeDownloader:
             d: Progress dictionary from yt-dlp
         """
         if d['status'] == 'downloading':
+            # yt-dlp calls this many times per second per fragment
+            if not logger.isEnabledFor(logging.INFO):
+                return
+            key = d.get('info_dict', {}).get('id') or d.get('filename')
+            now = time.monotonic()
+            if now - self._last_log_ts.get(key, 0.0) < PROGRESS_LOG_INTERVAL:
+                return
+            self._last_log_ts[key] = now
+
             total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
             downloaded = d.get('downloaded_bytes', 0)
 
@@ -111,6 +529,7 @@ class YouTubeDownloader:
                     f"ETA: {eta}s"
                 )
         elif d['status'] == 'finished':
+            self._last_log_ts.pop(d.get('info_dict', {}).get('id') or d.get('filename'), None)
             logger.info(f"Download finished, now processing...")
 
     def download_video(
@@ -125,7 +544,12 @@ class YouTubeDownloader:
         use_oauth: bool = False,
         use_cookies_from_browser: Optional[str] = None,
         cookies_file: Optional[str] = None,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        preextracted_info: Optional[Dict] = None,
+        concurrent_fragments: int = 8,
+        chunk_size_mb: int = 10,
+        write_json: bool = True,
+        subtitles_source: Literal['prefer_manual', 'manual'] = 'prefer_manual'
     ) -> Dict:
         """
         Download YouTube video with metadata.
@@ -142,6 +566,16 @@ class YouTubeDownloader:
             use_cookies_from_browser: Browser to extract cookies from ('chrome', 'firefox', 'edge', etc.)
             cookies_file: Path to Netscape cookies.txt file
             progress_callback: Custom progress callback function
+            preextracted_info: Flat yt-dlp entry already fetched for this video
+                (e.g. from a playlist listing); used instead of a YouTubeParser
+                metadata round-trip
+            concurrent_fragments: Number of HLS/DASH fragments fetched in parallel
+            chunk_size_mb: HTTP range request size in MB for non-fragmented formats
+            write_json: Write *_metadata.json and *_download_result.json; when
+                False the caller is responsible for writing both files
+            subtitles_source: 'prefer_manual' lets yt-dlp take manual subtitles and
+                fall back to auto-generated ones per language; 'manual' skips
+                auto-generated subtitles entirely
 
         Returns:
             Dictionary with download information:
@@ -164,15 +598,18 @@ class YouTubeDownloader:
 
         # Extract metadata first (if enabled)
         metadata = {}
-        if extract_metadata:
+        if extract_metadata and preextracted_info:
+            metadata = self._metadata_from_entry(preextracted_info, video_id)
+            logger.info(f"Using pre-extracted metadata: {metadata['metadata']['title']}")
+        elif extract_metadata:
             try:
+                # YouTubeParser caches video metadata by ID
                 logger.info("Extracting metadata with YouTubeParser...")
-                parsed_data = self.parser.parse_youtube_video(
+                metadata = self.parser.parse_youtube_video(
                     url,
                     extract_subtitles=False,  # We'll download them with yt-dlp
                     use_oauth=use_oauth
                 )
-                metadata = parsed_data
                 logger.info(f"Metadata extracted: {metadata['metadata']['title']}")
             except Exception as e:
                 logger.warning(f"Could not extract metadata with parser: {e}")
@@ -192,15 +629,13 @@ class YouTubeDownloader:
 
         # Configure yt-dlp options
         ydl_opts = {
+            **_BASE_YDL_OPTS,
             'outtmpl': str(video_dir / f"{filename}.%(ext)s"),
             'progress_hooks': [progress_callback or self._progress_hook],
-            'writeinfojson': True,  # Save yt-dlp's own metadata
-            'writethumbnail': True,  # Download thumbnail
-            'writedescription': True,  # Save description
             'writesubtitles': download_subtitles,
-            'writeautomaticsub': download_subtitles,
-            'quiet': False,
-            'no_warnings': False,
+            'writeautomaticsub': download_subtitles and subtitles_source != 'manual',
+            'concurrent_fragment_downloads': concurrent_fragments,
+            'http_chunk_size': chunk_size_mb * 1024 * 1024,
         }
 
         # Add cookie support for age-restricted videos
@@ -220,14 +655,11 @@ class YouTubeDownloader:
                 'preferredquality': '192',
             }]
         else:
-            if quality == 'best':
-                ydl_opts['format'] = 'bestvideo+bestaudio/best'
-            elif quality == 'worst':
-                ydl_opts['format'] = 'worstvideo+worstaudio/worst'
-            else:
-                # Specific quality (e.g., '720p')
-                height = quality.replace('p', '')
-                ydl_opts['format'] = f'bestvideo[height<={height}]+bestaudio/best[height<={height}]'
+            ydl_opts['format'] = (
+                _QUALITY_FORMATS.get(quality)
+                or _HEIGHT_FORMATS.get(quality)
+                or _height_format(quality.replace('p', ''))
+            )
 
             # Merge to mp4
             ydl_opts['merge_output_format'] = 'mp4'
@@ -245,28 +677,8 @@ class YouTubeDownloader:
             ydl_opts['password'] = ''
 
         # Download with yt-dlp
-        download_info = {}
-        video_path = None
-        subtitle_paths = []
-
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                logger.info(f"Downloading video from: {url}")
-                download_info = ydl.extract_info(url, download=True)
-
-                # Determine actual video path
-                if audio_only:
-                    video_path = video_dir / f"{filename}.mp3"
-                else:
-                    video_path = video_dir / f"{filename}.mp4"
-
-                # Find subtitle files
-                for file in video_dir.glob(f"{filename}*.vtt"):
-                    subtitle_paths.append(str(file))
-                for file in video_dir.glob(f"{filename}*.srt"):
-                    subtitle_paths.append(str(file))
-
-                logger.info(f"Download completed: {video_path}")
+            download_info = self._run_ytdlp(ydl_opts, url)
 
         except Exception as e:
             error_msg = str(e).lower()
@@ -281,22 +693,18 @@ class YouTubeDownloader:
                         f"{'='*70}\n"
                         f"Attempting to use cookies from your browser...\n"
                     )
-                    # Try Chrome first (most common)
+                    # Probe each browser cheaply, then download once with the one that works
+                    browser = self._find_cookie_browser(url)
                     try:
-                        return self.download_video(
-                            url=url,
-                            quality=quality,
-                            download_subtitles=download_subtitles,
-                            subtitle_languages=subtitle_languages,
-                            audio_only=audio_only,
-                            custom_filename=custom_filename,
-                            extract_metadata=extract_metadata,
-                            use_oauth=use_oauth,
-                            use_cookies_from_browser='chrome',
-                            progress_callback=progress_callback
-                        )
-                    except Exception as chrome_error:
-                        # If Chrome fails, provide helpful error message
+                        if browser is None:
+                            raise RuntimeError(
+                                f"No usable YouTube cookies found in: {', '.join(_BROWSER_CANDIDATES)}"
+                            )
+                        # Everything up to the download succeeded, so only switch cookies
+                        ydl_opts['cookiesfrombrowser'] = (browser,)
+                        download_info = self._run_ytdlp(ydl_opts, url)
+                    except Exception as cookie_error:
+                        # If no browser works, provide helpful error message
                         logger.error(
                             f"\n{'='*70}\n"
                             f"Failed to download age-restricted video: {video_id}\n"
@@ -313,7 +721,7 @@ class YouTubeDownloader:
                             f"   See: https://github.com/yt-dlp/yt-dlp/wiki/FAQ#how-do-i-pass-cookies-to-yt-dlp\n"
                             f"{'='*70}\n"
                             f"Original error: {e}\n"
-                            f"Chrome cookie error: {chrome_error}\n"
+                            f"Browser cookie error: {cookie_error}\n"
                             f"{'='*70}"
                         )
                         raise RuntimeError(
@@ -335,16 +743,45 @@ class YouTubeDownloader:
                         f"{'='*70}"
                     )
                     raise
-            raise
+            else:
+                raise
+
+        # Determine actual video path
+        if audio_only:
+            video_path = video_dir / f"{filename}.mp3"
+        else:
+            video_path = video_dir / f"{filename}.mp4"
+
+        logger.info(f"Download completed: {video_path}")
+
+        metadata_path = video_dir / f"{filename}_metadata.json" if metadata else None
+        result_path = video_dir / f"{filename}_download_result.json"
+
+        # Find subtitles and the files yt-dlp wrote next to the video
+        aux_files = _scan_aux_files(video_dir, filename)
 
         # Save our extracted metadata
-        metadata_path = None
-        if metadata:
-            metadata_path = video_dir / f"{filename}_metadata.json"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+        if metadata_path and write_json:
+            _write_json(metadata_path, metadata)
             logger.info(f"Metadata saved to: {metadata_path}")
 
+        raw_summary = {
+            'duration': download_info.get('duration'),
+            'upload_date': download_info.get('upload_date'),
+            'uploader': download_info.get('uploader'),
+            'view_count': download_info.get('view_count'),
+            'like_count': download_info.get('like_count'),
+            'channel': download_info.get('channel'),
+            'resolution': download_info.get('resolution'),
+            'fps': download_info.get('fps'),
+            'filesize': download_info.get('filesize') or download_info.get('filesize_approx'),
+        }
+        # Keep only JSON-native values so the result serializes without a default hook
+        summary = {
+            k: v if isinstance(v, _JSON_SCALARS) else str(v)
+            for k, v in raw_summary.items()
+        }
+
         # Create comprehensive result
         result = {
             'video_id': video_id,
@@ -352,29 +789,21 @@ class YouTubeDownloader:
             'video_path': str(video_path),
             'video_dir': str(video_dir),
             'metadata_path': str(metadata_path) if metadata_path else None,
-            'subtitle_paths': subtitle_paths,
-            'thumbnail_path': str(video_dir / f"{filename}.jpg") if (video_dir / f"{filename}.jpg").exists() else None,
-            'description_path': str(video_dir / f"{filename}.description") if (video_dir / f"{filename}.description").exists() else None,
-            'info_json_path': str(video_dir / f"{filename}.info.json") if (video_dir / f"{filename}.info.json").exists() else None,
+            'result_path': str(result_path),
+            'subtitle_paths': aux_files['subtitle_paths'],
+            'thumbnail_path': aux_files['thumbnail_path'],
+            'description_path': aux_files['description_path'],
+            'info_json_path': aux_files['info_json_path'],
             'metadata': metadata,
-            'download_info': {
-                'duration': download_info.get('duration'),
-                'upload_date': download_info.get('upload_date'),
-                'uploader': download_info.get('uploader'),
-                'view_count': download_info.get('view_count'),
-                'like_count': download_info.get('like_count'),
-                'channel': download_info.get('channel'),
-                'resolution': download_info.get('resolution'),
-                'fps': download_info.get('fps'),
-                'filesize': download_info.get('filesize') or download_info.get('filesize_approx'),
-            },
-            'downloaded_at': datetime.now().isoformat(),
+            'download_info': summary,
+            'downloaded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
         }
 
+        if not write_json:
+            return result
+
         # Save combined result
-        result_path = video_dir / f"{filename}_download_result.json"
-        with open(result_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+        _write_json(result_path, result)
 
         logger.info(f"Download result saved to: {result_path}")
         logger.info(f"All files saved to: {video_dir}")
@@ -387,6 +816,7 @@ class YouTubeDownloader:
         quality: str = 'best',
         download_subtitles: bool = True,
         max_downloads: Optional[int] = None,
+        max_workers: int = 4,
         **kwargs
     ) -> List[Dict]:
         """
@@ -397,56 +827,150 @@ class YouTubeDownloader:
             quality: Video quality
             download_subtitles: Whether to download subtitles
             max_downloads: Maximum number of videos to download
+            max_workers: Number of videos downloaded concurrently
             **kwargs: Additional arguments passed to download_video
 
         Returns:
-            List of download results for each video
+            List of download results for each video, in playlist order
         """
         if not YT_DLP_AVAILABLE:
             raise ImportError("yt-dlp is required for playlist downloads")
 
         logger.info(f"Fetching playlist information: {playlist_url}")
 
-        # Extract playlist info
-        ydl_opts = {
-            'quiet': True,
-            'extract_flat': True,
-        }
+        # Downloads are I/O bound and independent, so overlap them, starting
+        # each one as soon as its playlist entry arrives
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            with yt_dlp.YoutubeDL(dict(_PLAYLIST_YDL_OPTS)) as ydl:
+                entries = itertools.islice(_iter_playlist_videos(ydl, playlist_url), max_downloads or None)
+                for idx, video in enumerate(entries):
+                    video_url = _entry_url(video)
+                    logger.info(f"Queueing video {idx + 1}: {video.get('title', video_url)}")
+                    future = executor.submit(
+                        self.download_video,
+                        url=video_url,
+                        quality=quality,
+                        download_subtitles=download_subtitles,
+                        preextracted_info=video,
+                        **kwargs
+                    )
+                    futures[future] = (idx, video)
+
+            logger.info(f"Found {len(futures)} videos in playlist")
+
+            results: List[Optional[Dict]] = [None] * len(futures)
+            for future in as_completed(futures):
+                idx, video = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to download {video.get('id') or video.get('url')}: {e}")
+                    results[idx] = {
+                        'video_id': video.get('id'),
+                        'error': str(e),
+                        'status': 'failed'
+                    }
+
+        logger.info(f"Playlist download completed: {len([r for r in results if 'error' not in r])}/{len(results)} successful")
+        return results
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            playlist_info = ydl.extract_info(playlist_url, download=False)
 
-        if 'entries' not in playlist_info:
-            raise ValueError("Not a valid playlist URL")
+    async def download_video_async(self, url: str, **kwargs) -> Dict:
+        """
+        Download a YouTube video without blocking the event loop.
 
-        videos = playlist_info['entries']
-        if max_downloads:
-            videos = videos[:max_downloads]
+        The download runs in a worker thread; the metadata and result JSON
+        files are then written concurrently with async file I/O.
 
+        Args:
+            url: YouTube URL
+            **kwargs: Additional arguments passed to download_video
+
+        Returns:
+            Download result dictionary
+        """
+        # The JSON files are written here rather than in the worker thread
+        write_json = kwargs.pop('write_json', True)
+        result = await asyncio.to_thread(self.download_video, url, write_json=False, **kwargs)
+        if not write_json:
+            return result
+
+        writes = []
+        if result['metadata_path']:
+            writes.append(_write_json_async(Path(result['metadata_path']), result['metadata']))
+        writes.append(_write_json_async(Path(result['result_path']), result))
+        await asyncio.gather(*writes)
+
+        logger.info(f"Download result saved to: {result['result_path']}")
+        return result
+
+    async def download_playlist_async(
+        self,
+        playlist_url: str,
+        quality: str = 'best',
+        download_subtitles: bool = True,
+        max_downloads: Optional[int] = None,
+        *,
+        max_concurrent: int = 4,
+        **kwargs
+    ) -> List[Dict]:
+        """
+        Download a YouTube playlist without blocking the event loop.
+
+        Each video is downloaded in a worker thread, with at most
+        `max_concurrent` downloads in flight.
+
+        Args:
+            playlist_url: YouTube playlist URL
+            quality: Video quality
+            download_subtitles: Whether to download subtitles
+            max_downloads: Maximum number of videos to download
+            max_concurrent: Maximum number of simultaneous downloads
+            **kwargs: Additional arguments passed to download_video
+
+        Returns:
+            List of download results for each video, in playlist order
+        """
+        if not YT_DLP_AVAILABLE:
+            raise ImportError("yt-dlp is required for playlist downloads")
+
+        logger.info(f"Fetching playlist information: {playlist_url}")
+
+        def fetch_entries() -> List[Dict]:
+            with yt_dlp.YoutubeDL(dict(_PLAYLIST_YDL_OPTS)) as ydl:
+                entries = _iter_playlist_videos(ydl, playlist_url)
+                return list(itertools.islice(entries, max_downloads or None))
+
+        videos = await asyncio.to_thread(fetch_entries)
         logger.info(f"Found {len(videos)} videos in playlist")
 
-        results = []
-        for idx, video in enumerate(videos, 1):
-            video_url = f"https://www.youtube.com/watch?v={video['id']}"
-            logger.info(f"Downloading video {idx}/{len(videos)}: {video.get('title', video['id'])}")
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-            try:
-                result = self.download_video(
-                    url=video_url,
+        async def download(video: Dict) -> Dict:
+            async with semaphore:
+                return await self.download_video_async(
+                    url=_entry_url(video),
                     quality=quality,
                     download_subtitles=download_subtitles,
+                    preextracted_info=video,
                     **kwargs
                 )
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to download {video_url}: {e}")
-                results.append({
-                    'video_id': video['id'],
-                    'error': str(e),
+
+        outcomes = await asyncio.gather(*(download(v) for v in videos), return_exceptions=True)
+
+        results = []
+        for video, outcome in zip(videos, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to download {video.get('id') or video.get('url')}: {outcome}")
+                outcome = {
+                    'video_id': video.get('id'),
+                    'error': str(outcome),
                     'status': 'failed'
-                })
+                }
+            results.append(outcome)
 
-        logger.info(f"Playlist download completed: {len([r for r in results if 'error' not in r])}/{len(videos)} successful")
+        logger.info(f"Playlist download completed: {len([r for r in results if 'error' not in r])}/{len(results)} successful")
         return results
 
 
@@ -473,14 +997,40 @@ def download_youtube_video(
         Download result dictionary
     """
     downloader = YouTubeDownloader(download_dir=output_dir)
-    return downloader.download_video(
-        url=url,
-        quality=quality,
-        download_subtitles=download_subtitles,
-        audio_only=audio_only,
-        **kwargs
-    )
+    try:
+        return downloader.download_video(
+            url=url,
+            quality=quality,
+            download_subtitles=download_subtitles,
+            audio_only=audio_only,
+            **kwargs
+        )
+    finally:
+        downloader.close()
+
+
+
+async def download_youtube_video_async(
+    url: str,
+    output_dir: Optional[Path] = None,
+    **kwargs
+) -> Dict:
+    """
+    Async variant of download_youtube_video.
 
+    Args:
+        url: YouTube URL
+        output_dir: Directory to save video
+        **kwargs: Additional arguments passed to YouTubeDownloader.download_video
+
+    Returns:
+        Download result dictionary
+    """
+    downloader = YouTubeDownloader(download_dir=output_dir)
+    try:
+        return await downloader.download_video_async(url, **kwargs)
+    finally:
+        downloader.close()
 
 if __name__ == "__main__":
     # Example usage
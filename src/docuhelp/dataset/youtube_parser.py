@@ -1,10 +1,16 @@
 """YouTube video parser for extracting metadata, timestamps, and subtitles."""
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import asyncio
 import re
-from datetime import datetime, timedelta
+import time
 import json
 import logging
+import threading
+
+if TYPE_CHECKING:
+    import numpy as np
 
 try:
     from youtube_transcript_api import YouTubeTranscriptApi
@@ -19,8 +25,146 @@ try:
 except ImportError:
     PYTUBE_AVAILABLE = False
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+try:
+    from diskcache import Cache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Video ID in watch (v= as first or later query parameter), youtu.be, embed and v URLs
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^&#\s]*&)*v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+_BARE_ID_RE = re.compile(r'[a-zA-Z0-9_-]{11}')
+
+# ?t=123 or &t=123 or ?t=123s or &t=123s
+_URL_TS_RE = re.compile(r'[?&]t=(\d+)s?')
+
+# Description chapter lines, e.g. "1:23 - Main content" or "[2:45] Section name".
+# [^\S\n] is whitespace other than newline, so each match stays on one line.
+# Uses RE2's linear-time engine when available, since descriptions are untrusted input.
+_DESC_TS_PATTERN = r'(?m)^[^\S\n]*\[?(\d{1,2}:\d{2}(?::\d{2})?)\]?[^\S\n]*[-:]?[^\S\n]*(.*\S)'
+_DESC_TS_RE = (re2 if RE2_AVAILABLE else re).compile(_DESC_TS_PATTERN)
+
+# Above this many timestamps, parse them with NumPy instead of one at a time
+_BULK_PARSE_THRESHOLD = 32
+
+# Video metadata cache, keyed by video ID: in memory (cachetools) and on disk
+# (diskcache) so other processes can reuse it
+METADATA_CACHE_TTL = 3600
+METADATA_CACHE_DIR = Path.home() / '.cache' / 'docuhelp' / 'yt_meta'
+_META_MEMORY = TTLCache(maxsize=1024, ttl=METADATA_CACHE_TTL) if CACHETOOLS_AVAILABLE else None
+_META_DISK = None
+_META_LOCK = threading.Lock()
+
+
+def _get_cached_metadata(video_id: str) -> Optional[Dict]:
+    """Return cached metadata for video_id, or None on a miss."""
+    global _META_DISK
+    with _META_LOCK:
+        if _META_MEMORY is not None and video_id in _META_MEMORY:
+            return _META_MEMORY[video_id]
+        if not DISKCACHE_AVAILABLE:
+            return None
+        if _META_DISK is None:
+            _META_DISK = Cache(str(METADATA_CACHE_DIR))
+        metadata = _META_DISK.get(video_id)
+        if metadata is not None and _META_MEMORY is not None:
+            _META_MEMORY[video_id] = metadata
+        return metadata
+
+
+def _set_cached_metadata(video_id: str, metadata: Dict) -> None:
+    """Store metadata for video_id in the memory and disk caches."""
+    with _META_LOCK:
+        if _META_MEMORY is not None:
+            _META_MEMORY[video_id] = metadata
+        if _META_DISK is not None:
+            _META_DISK.set(video_id, metadata, expire=METADATA_CACHE_TTL)
+
+
+def clear_metadata_cache() -> None:
+    """Remove all entries from the in-memory and on-disk video metadata caches."""
+    global _META_DISK
+    with _META_LOCK:
+        if _META_MEMORY is not None:
+            _META_MEMORY.clear()
+        if DISKCACHE_AVAILABLE:
+            if _META_DISK is None:
+                _META_DISK = Cache(str(METADATA_CACHE_DIR))
+            _META_DISK.clear()
+    logger.info("Metadata cache cleared")
+
+
+# Transcript listings per video (shared by all language lookups) and fetched
+# transcripts per (video_id, language); transcripts are bounded by their
+# total number of segments rather than by count
+TRANSCRIPT_LIST_TTL = 3600
+TRANSCRIPT_CACHE_MAX_SEGMENTS = 200_000
+_TRANSCRIPT_LISTS = TTLCache(maxsize=1024, ttl=TRANSCRIPT_LIST_TTL) if CACHETOOLS_AVAILABLE else None
+_TRANSCRIPT_LISTS_LOCK = threading.Lock()
+_TRANSCRIPTS = (
+    TTLCache(maxsize=TRANSCRIPT_CACHE_MAX_SEGMENTS, ttl=TRANSCRIPT_LIST_TTL, getsizeof=len)
+    if CACHETOOLS_AVAILABLE else None
+)
+_TRANSCRIPTS_LOCK = threading.Lock()
+
+
+def _list_transcripts(video_id: str):
+    """Return the (cached) youtube-transcript-api transcript list for video_id."""
+    if _TRANSCRIPT_LISTS is None:
+        return YouTubeTranscriptApi.list_transcripts(video_id)
+    with _TRANSCRIPT_LISTS_LOCK:
+        transcript_list = _TRANSCRIPT_LISTS.get(video_id)
+    if transcript_list is None:
+        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        with _TRANSCRIPT_LISTS_LOCK:
+            _TRANSCRIPT_LISTS[video_id] = transcript_list
+    return transcript_list
+
+
+def _fetch_transcript(video_id: str, lang: str) -> List[Dict]:
+    """
+    Fetch (and cache) the transcript for video_id in one language.
+
+    The cache holds an immutable tuple; callers get their own copy of the
+    segments, so mutating a result can't affect later lookups.
+    """
+    key = (video_id, lang)
+    segments = None
+    if _TRANSCRIPTS is not None:
+        with _TRANSCRIPTS_LOCK:
+            segments = _TRANSCRIPTS.get(key)
+    if segments is None:
+        segments = tuple(_list_transcripts(video_id).find_transcript([lang]).fetch())
+        if _TRANSCRIPTS is not None:
+            with _TRANSCRIPTS_LOCK:
+                try:
+                    _TRANSCRIPTS[key] = segments
+                except ValueError:  # Larger than the whole cache
+                    pass
+    return [dict(segment) for segment in segments]
+
 
 class YouTubeParser:
     """Parser for YouTube videos to extract metadata, timestamps, and subtitles."""
@@ -42,18 +186,14 @@ class YouTubeParser:
         Returns:
             Video ID or None if invalid
         """
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/v\/)([a-zA-Z0-9_-]{11})',
-            r'(?:youtube\.com\/watch\?.*&v=)([a-zA-Z0-9_-]{11})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        # Every URL form contains "youtu"; anything else can only be a bare ID
+        if 'youtu' in url:
+            match = _VIDEO_ID_RE.search(url)
             if match:
                 return match.group(1)
 
         # If URL is just the video ID
-        if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
+        if _BARE_ID_RE.fullmatch(url):
             return url
 
         return None
@@ -86,6 +226,37 @@ class YouTubeParser:
         else:
             raise ValueError(f"Invalid timestamp format: {timestamp_str}")
 
+    @classmethod
+    def parse_timestamps_bulk(cls, timestamp_strs: List[str]) -> "np.ndarray":
+        """
+        Parse many timestamp strings to seconds at once.
+
+        Accepts the same formats as parse_timestamp.
+
+        Args:
+            timestamp_strs: Timestamp strings
+
+        Returns:
+            Array of total seconds (int64), in input order
+        """
+        # Only long chapter lists take this path, so NumPy is imported here
+        import numpy as np
+
+        if not timestamp_strs:
+            return np.empty(0, dtype=np.int64)
+
+        arr = np.char.strip(np.asarray(timestamp_strs, dtype=str))
+        colons = np.char.count(arr, ':')
+        if colons.max() > 2:
+            bad = timestamp_strs[int(np.argmax(colons > 2))]
+            raise ValueError(f"Invalid timestamp format: {bad}")
+
+        # Left-pad every entry to HH:MM:SS so the fields reshape into columns
+        prefixes = np.array(['0:0:', '0:', ''])[colons]
+        padded = np.char.add(prefixes, arr)
+        fields = np.array(':'.join(padded.tolist()).split(':'), dtype=np.int64)
+        return fields.reshape(-1, 3) @ np.array([3600, 60, 1], dtype=np.int64)
+
     @staticmethod
     def format_timestamp(seconds: int) -> str:
         """
@@ -97,14 +268,12 @@ class YouTubeParser:
         Returns:
             Formatted timestamp string
         """
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
+        minutes, secs = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
 
         if hours > 0:
             return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
+        return f"{minutes:02d}:{secs:02d}"
 
     def extract_url_timestamp(self, url: str) -> Optional[int]:
         """
@@ -116,8 +285,7 @@ class YouTubeParser:
         Returns:
             Timestamp in seconds or None
         """
-        # Match ?t=123 or &t=123 or ?t=123s or &t=123s
-        match = re.search(r'[?&]t=(\d+)s?', url)
+        match = _URL_TS_RE.search(url)
         if match:
             return int(match.group(1))
         return None
@@ -143,6 +311,12 @@ class YouTubeParser:
         if not video_id:
             raise ValueError(f"Invalid YouTube URL: {url}")
 
+        # The URL timestamp is the only per-URL field, so it is never cached
+        cached = _get_cached_metadata(video_id)
+        if cached is not None:
+            logger.info(f"Using cached metadata for video: {video_id}")
+            return {**cached, 'url_timestamp': self.extract_url_timestamp(url)}
+
         try:
             yt = YouTube(
                 f"https://www.youtube.com/watch?v={video_id}",
@@ -162,8 +336,9 @@ class YouTubeParser:
                 'thumbnail_url': yt.thumbnail_url,
                 'rating': yt.rating,
                 'url': f"https://www.youtube.com/watch?v={video_id}",
-                'url_timestamp': self.extract_url_timestamp(url),
             }
+            _set_cached_metadata(video_id, metadata)
+            metadata = {**metadata, 'url_timestamp': self.extract_url_timestamp(url)}
 
             logger.info(f"Extracted metadata for video: {video_id} - {yt.title}")
             return metadata
@@ -232,14 +407,12 @@ class YouTubeParser:
 
         try:
             # Get list of available transcripts
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcript_list = _list_transcripts(video_id)
 
             # Try to get requested languages
             for lang in languages:
                 try:
-                    transcript = transcript_list.find_transcript([lang])
-                    subtitle_data = transcript.fetch()
-                    subtitles[lang] = subtitle_data
+                    subtitles[lang] = _fetch_transcript(video_id, lang)
                     logger.info(f"Found {lang} subtitles for {video_id}")
                     break  # Stop after finding first match
                 except NoTranscriptFound:
@@ -296,29 +469,17 @@ class YouTubeParser:
                 ...
             ]
         """
-        timestamps = []
-        lines = description.split('\n')
+        matches = [match.groups() for match in _DESC_TS_RE.finditer(description)]
 
-        # Pattern to match timestamps
-        timestamp_pattern = r'\[?(\d{1,2}:\d{2}(?::\d{2})?)\]?\s*[-:]?\s*(.+)'
-
-        for line in lines:
-            line = line.strip()
-            match = re.match(timestamp_pattern, line)
-
-            if match:
-                time_str = match.group(1)
-                label = match.group(2).strip()
+        if len(matches) > _BULK_PARSE_THRESHOLD:
+            seconds = self.parse_timestamps_bulk([time_str for time_str, _ in matches]).tolist()
+        else:
+            seconds = [self.parse_timestamp(time_str) for time_str, _ in matches]
 
-                try:
-                    time_seconds = self.parse_timestamp(time_str)
-                    timestamps.append({
-                        'time': time_seconds,
-                        'time_formatted': time_str,
-                        'label': label
-                    })
-                except ValueError:
-                    continue
+        timestamps = [
+            {'time': time_seconds, 'time_formatted': time_str, 'label': label}
+            for time_seconds, (time_str, label) in zip(seconds, matches)
+        ]
 
         logger.info(f"Found {len(timestamps)} timestamps in description")
         return timestamps
@@ -351,6 +512,58 @@ class YouTubeParser:
         # Get metadata
         metadata = self.get_video_metadata(url, use_oauth, allow_oauth_cache)
 
+        # Get subtitles
+        subtitles = {}
+        if extract_subtitles:
+            subtitles = self._get_subtitles_safe(video_id, subtitle_languages)
+
+        return self._build_parse_result(video_id, url, metadata, subtitles)
+
+    async def parse_youtube_video_async(
+        self,
+        url: str,
+        extract_subtitles: bool = True,
+        subtitle_languages: Optional[List[str]] = None,
+        use_oauth: bool = False,
+        allow_oauth_cache: bool = True
+    ) -> Dict:
+        """
+        Complete parsing of YouTube video, fetching metadata and subtitles concurrently.
+
+        Args:
+            url: YouTube URL
+            extract_subtitles: Whether to extract subtitles
+            subtitle_languages: List of language codes for subtitles
+            use_oauth: Use OAuth authentication for age-restricted videos
+            allow_oauth_cache: Allow caching of OAuth credentials
+
+        Returns:
+            Complete video data including metadata, timestamps, and subtitles
+        """
+        video_id = self.extract_video_id(url)
+        if not video_id:
+            raise ValueError(f"Invalid YouTube URL: {url}")
+
+        # Both are blocking network calls, so run them in worker threads side by side
+        meta_task = asyncio.to_thread(self.get_video_metadata, url, use_oauth, allow_oauth_cache)
+        if extract_subtitles:
+            sub_task = asyncio.to_thread(self._get_subtitles_safe, video_id, subtitle_languages)
+            metadata, subtitles = await asyncio.gather(meta_task, sub_task)
+        else:
+            metadata, subtitles = await meta_task, {}
+
+        return self._build_parse_result(video_id, url, metadata, subtitles)
+
+    def _get_subtitles_safe(self, video_id: str, languages: Optional[List[str]]) -> Dict[str, List[Dict]]:
+        """Fetch subtitles, logging and returning no tracks on failure."""
+        try:
+            return self.get_subtitles(video_id, languages)
+        except Exception as e:
+            logger.warning(f"Could not extract subtitles: {e}")
+            return {}
+
+    def _build_parse_result(self, video_id: str, url: str, metadata: Dict, subtitles: Dict) -> Dict:
+        """Assemble the parse_youtube_video result from fetched metadata and subtitles."""
         # Parse timestamps from description
         description_timestamps = []
         if metadata.get('description'):
@@ -358,14 +571,6 @@ class YouTubeParser:
                 metadata['description']
             )
 
-        # Get subtitles
-        subtitles = {}
-        if extract_subtitles:
-            try:
-                subtitles = self.get_subtitles(video_id, subtitle_languages)
-            except Exception as e:
-                logger.warning(f"Could not extract subtitles: {e}")
-
         result = {
             'video_id': video_id,
             'url': url,
@@ -374,7 +579,7 @@ class YouTubeParser:
             'subtitles': subtitles,
             'has_subtitles': len(subtitles) > 0,
             'subtitle_languages': list(subtitles.keys()),
-            'parsed_at': datetime.now().isoformat(),
+            'parsed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
         }
 
         logger.info(
@@ -395,11 +600,36 @@ class YouTubeParser:
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(parsed_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            output_path.write_bytes(
+                orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(parsed_data, f, indent=2, ensure_ascii=False)
 
         logger.info(f"Saved parsed data to {output_path}")
 
+    def save_parsed_data_many(
+        self,
+        items: Iterable[Tuple[Dict, Path]],
+        max_workers: int = 8
+    ) -> None:
+        """
+        Save many parsed videos to JSON files, overlapping the writes.
+
+        Args:
+            items: (parsed_data, output_path) pairs
+            max_workers: Number of files written concurrently
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.save_parsed_data, parsed_data, output_path)
+                for parsed_data, output_path in items
+            ]
+            for future in futures:
+                future.result()
+
 
 def parse_youtube_url(
     url: str,
@@ -425,6 +655,42 @@ def parse_youtube_url(
     return parser.parse_youtube_video(url, extract_subtitles, subtitle_languages, use_oauth, allow_oauth_cache)
 
 
+
+def parse_youtube_urls(
+    urls: Iterable[str],
+    extract_subtitles: bool = True,
+    subtitle_languages: Optional[List[str]] = None,
+    use_oauth: bool = False,
+    allow_oauth_cache: bool = True,
+    max_workers: int = 16
+) -> Iterator[Dict]:
+    """
+    Parse many YouTube videos concurrently.
+
+    Parsing is network-bound, so URLs are processed on a thread pool sharing
+    one YouTubeParser; duplicate URLs are served from the metadata cache.
+
+    Args:
+        urls: YouTube URLs
+        extract_subtitles: Whether to extract subtitles
+        subtitle_languages: List of language codes for subtitles
+        use_oauth: Use OAuth authentication for age-restricted videos
+        allow_oauth_cache: Allow caching of OAuth credentials
+        max_workers: Number of videos parsed concurrently
+
+    Yields:
+        Parsed video data for each URL, in input order. A failed URL raises
+        its exception when its result is reached.
+    """
+    parser = YouTubeParser()
+
+    def parse(url: str) -> Dict:
+        return parser.parse_youtube_video(url, extract_subtitles, subtitle_languages, use_oauth, allow_oauth_cache)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(parse, urls)
+
+
 if __name__ == "__main__":
     # Example usage
     logging.basicConfig(level=logging.INFO)
@@ -9,6 +9,7 @@ import logging
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from .responses import FastJSONResponse
 from .routes import video, feedback, report
 from ..firebase_config import initialize_firebase
 
@@ -48,10 +49,16 @@ app = FastAPI(
     description="AI-powered surgical video analysis and report generation",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
-allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+# Strip and drop blanks once here so stray spaces in the env var never cause origin mismatches
+allowed_origins = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -83,5 +90,21 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+
+    # Reload mode only supports a single worker, so keep it for development.
+    # Run one worker unless WEB_CONCURRENCY is set: the VLM client and decoded
+    # alternative frames are cached per process, and without Celery
+    # (CELERY_BROKER_URL) VLM jobs run as BackgroundTasks in the worker that
+    # took the upload, so multi-worker deployments should use the Celery path.
+    debug = os.getenv("DEBUG", "false").lower() == "true"
+    uvicorn.run(
+        "docuhelp.ui.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        reload=debug,
+        workers=1 if debug else int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
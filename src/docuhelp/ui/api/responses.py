@@ -0,0 +1,12 @@
+"""JSON response class shared by the API app and its routers."""
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ORJSONResponse requires orjson, so fall back to the stdlib encoder without it
+FastJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
@@ -1,63 +1,51 @@
 """Report endpoints for report generation and evaluation"""
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, ValidationError
+import functools
+import json
 import logging
+import os
 from typing import Optional
 
-logger = logging.getLogger(__name__)
-
-router = APIRouter()
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
-class ReportEvaluationRequest(BaseModel):
-    report: str
-    procedure: str
-    phases_count: int = 0
-
+from ..responses import ORJSON_AVAILABLE, FastJSONResponse
 
-@router.post("/evaluate")
-async def evaluate_report(request: ReportEvaluationRequest):
-    """
-    Evaluate a surgical report for accuracy, completeness, and quality using LLM.
+if ORJSON_AVAILABLE:
+    import orjson
 
-    Args:
-        request: Report evaluation request with report text, procedure name, and phases count
+logger = logging.getLogger(__name__)
 
-    Returns:
-        Accuracy score (0-100) and detailed evaluation criteria
-    """
-    try:
-        from openai import OpenAI
-        import os
-        import json
-        import re
+EvaluationResponse = FastJSONResponse
 
-        # Initialize OpenRouter client for evaluation
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        if not api_key:
-            raise HTTPException(status_code=500, detail="OpenRouter API key not configured")
+router = APIRouter()
 
-        client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key
-        )
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
-        # Build comprehensive evaluation prompt
-        evaluation_prompt = f"""You are an expert surgical documentation evaluator. Evaluate the following surgical report for a {request.procedure} procedure.
+EVALUATION_PROMPT_TEMPLATE = """You are an expert surgical documentation evaluator. Evaluate the following surgical report for a {procedure} procedure.
 
 **REPORT TO EVALUATE:**
-{request.report}
+{report}
 
 **EVALUATION CRITERIA:**
 
 Analyze this report across these dimensions and provide a comprehensive assessment:
 
-1. **Completeness (0-100)**: Does the report cover all standard phases and steps expected in a {request.procedure} procedure?
-   - Compare against standard {request.procedure} documentation found in medical literature
+1. **Completeness (0-100)**: Does the report cover all standard phases and steps expected in a {procedure} procedure?
+   - Compare against standard {procedure} documentation found in medical literature
    - Check if all anatomical structures, instruments, and techniques are mentioned
-   - Verify {request.phases_count} phases were documented
+   - Verify {phases_count} phases were documented
 
 2. **Chronological Order (0-100)**: Are the surgical phases presented in the correct temporal sequence?
    - Verify timestamps are sequential and non-overlapping
@@ -95,10 +83,180 @@ Respond ONLY with valid JSON in this exact format:
 - The overall_score should be the weighted average: (completeness*0.3 + chronological*0.2 + clinical_accuracy*0.3 + terminology*0.2)
 """
 
+
+class _JsonObjectScanner:
+    """Incrementally tracks brace depth of a JSON object, ignoring braces inside strings."""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int:
+        """
+        Scan the next piece of text.
+
+        Args:
+            text: Next chunk of model output
+
+        Returns:
+            Index just past the closing brace of the first complete object,
+            or -1 if the object is not complete yet
+        """
+        for i, c in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif c == '\\':
+                    self.escaped = True
+                elif c == '"':
+                    self.in_string = False
+            elif c == '"' and self.started:
+                self.in_string = True
+            elif c == '{':
+                self.depth += 1
+                self.started = True
+            elif c == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """
+    Find the first complete JSON object in text with a linear brace scan.
+
+    Args:
+        text: Model output that may surround the JSON with extra text
+
+    Returns:
+        The JSON object text, or None if there is no complete object
+    """
+    start = text.find('{')
+    if start < 0:
+        return None
+    end = _JsonObjectScanner().feed(text[start:])
+    return text[start:start + end] if end >= 0 else None
+
+
+async def _read_json_stream(stream) -> str:
+    """
+    Collect streamed completion text up to the end of the first JSON object.
+
+    Args:
+        stream: Streaming chat completion
+
+    Returns:
+        Text received so far; the remaining tokens are not waited for once
+        the object is complete
+    """
+    scanner = _JsonObjectScanner()
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content or ''
+        end = scanner.feed(token)
+        if end >= 0:
+            parts.append(token[:end])
+            await stream.close()
+            break
+        parts.append(token)
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key: str) -> "AsyncOpenAI":
+    """Return a shared OpenRouter client, so its connection pool is reused across requests."""
+    if not OPENAI_AVAILABLE:
+        raise ImportError("openai is not installed. Install it with: pip install openai")
+    return AsyncOpenAI(base_url=OPENROUTER_BASE_URL, api_key=api_key)
+
+
+class ReportEvaluationRequest(BaseModel):
+    report: str
+    procedure: str
+    phases_count: int = 0
+
+
+if MSGSPEC_AVAILABLE:
+    # Same fields, decoded by msgspec; ReportEvaluationRequest still documents the body
+    class _EvaluationRequestStruct(msgspec.Struct):
+        report: str
+        procedure: str
+        phases_count: int = 0
+
+
+def _decode_evaluation_request(body: bytes) -> ReportEvaluationRequest:
+    """
+    Decode and validate an evaluation request body in one pass.
+
+    msgspec runs in lax mode so it accepts the same inputs as pydantic,
+    e.g. "3" for phases_count.
+
+    Args:
+        body: Raw JSON request body
+
+    Returns:
+        Validated request: the msgspec struct when msgspec is installed,
+        otherwise a ReportEvaluationRequest; both expose the same fields
+
+    Raises:
+        HTTPException: 422 if the body is not a valid evaluation request
+    """
+    try:
+        if MSGSPEC_AVAILABLE:
+            return msgspec.json.decode(body, type=_EvaluationRequestStruct, strict=False)
+        return ReportEvaluationRequest.model_validate_json(body)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post(
+    "/evaluate",
+    # The body is decoded by hand, so describe it for the OpenAPI schema explicitly
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ReportEvaluationRequest.model_json_schema()}},
+        }
+    },
+)
+async def evaluate_report(raw_request: Request):
+    """
+    Evaluate a surgical report for accuracy, completeness, and quality using LLM.
+
+    Args:
+        raw_request: HTTP request whose JSON body holds the report text,
+            procedure name, and phases count
+
+    Returns:
+        Accuracy score (0-100) and detailed evaluation criteria
+    """
+    request = _decode_evaluation_request(await raw_request.body())
+
+    try:
+        # Initialize OpenRouter client for evaluation
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="OpenRouter API key not configured")
+
+        client = _get_client(api_key)
+
+        # Build comprehensive evaluation prompt
+        evaluation_prompt = EVALUATION_PROMPT_TEMPLATE.format(
+            procedure=request.procedure,
+            report=request.report,
+            phases_count=request.phases_count,
+        )
+
         logger.info(f"Evaluating report for {request.procedure} with {request.phases_count} phases")
 
         # Call OpenRouter API for evaluation
-        response = client.chat.completions.create(
+        # Awaited so the event loop keeps serving other requests during the LLM call
+        response = await client.chat.completions.create(
             model="google/gemini-2.0-flash-exp:free",
             messages=[
                 {
@@ -106,17 +264,20 @@ Respond ONLY with valid JSON in this exact format:
                     "content": evaluation_prompt
                 }
             ],
-            temperature=0.3  # Lower temperature for more consistent evaluation
+            temperature=0.3,  # Lower temperature for more consistent evaluation
+            stream=True
         )
 
-        evaluation_text = response.choices[0].message.content.strip()
+        # Stop reading as soon as the JSON object is complete
+        evaluation_text = (await _read_json_stream(response)).strip()
 
         # Extract JSON from response (in case there's extra text)
-        json_match = re.search(r'\{.*\}', evaluation_text, re.DOTALL)
-        if json_match:
-            evaluation_text = json_match.group(0)
+        json_object = _extract_json_object(evaluation_text)
+        if json_object:
+            evaluation_text = json_object
 
-        evaluation_data = json.loads(evaluation_text)
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the fallback below still applies
+        evaluation_data = orjson.loads(evaluation_text) if ORJSON_AVAILABLE else json.loads(evaluation_text)
 
         # Calculate overall score if not provided
         if "overall_score" not in evaluation_data:
@@ -130,7 +291,7 @@ Respond ONLY with valid JSON in this exact format:
 
         logger.info(f"Report evaluation completed: {evaluation_data['overall_score']}%")
 
-        return JSONResponse(
+        return EvaluationResponse(
             status_code=200,
             content={
                 "accuracy_score": evaluation_data["overall_score"],
@@ -154,7 +315,7 @@ Respond ONLY with valid JSON in this exact format:
         logger.error(f"Failed to parse evaluation response: {e}")
         logger.error(f"Raw response: {evaluation_text}")
         # Fallback to simple scoring
-        return JSONResponse(
+        return EvaluationResponse(
             status_code=200,
             content={
                 "accuracy_score": 75,
@@ -1,50 +1,223 @@
 """Video endpoints for handling video uploads and processing"""
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Form, HTTPException, BackgroundTasks, Request
+from fastapi.responses import Response, StreamingResponse
+import asyncio
+import base64
+import binascii
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import io
+import json
 import logging
+import mmap
 import os
 from pathlib import Path
 import shutil
+import subprocess
 import uuid
 from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+import aiofiles
+import cv2
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from ..responses import ORJSON_AVAILABLE, FastJSONResponse
+
+if ORJSON_AVAILABLE:
+    import orjson
 
 logger = logging.getLogger(__name__)
 
+# Phase payloads carry long descriptions; orjson serializes them much faster
+VideoResponse = FastJSONResponse
+
 router = APIRouter()
 
 # Configure upload directory
 UPLOAD_DIR = Path("frontend/uploads/videos")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-# Check if Firebase is enabled
-# USE_FIREBASE = "false"
+# Uploads are written with O_DIRECT in aligned chunks where supported, keeping
+# multi-GB videos out of the page cache
+DIRECT_IO_CHUNK = 1024 * 1024
+DIRECT_IO_ALIGN = 4096
+
+# Leading bytes inspected to recognise an uploaded video container
+VIDEO_SIGNATURE_LENGTH = 12
+
+# ISO base media (MP4/MOV) box types that can open a file; older QuickTime
+# files may start with moov/mdat/wide/free instead of ftyp
+_ISO_BMFF_BOX_TYPES = frozenset({b"ftyp", b"moov", b"mdat", b"wide", b"free"})
+
+# Magic prefixes of the other containers in loader.VIDEO_EXTENSIONS:
+# EBML (MKV/WebM), ASF header GUID (WMV) and FLV
+_VIDEO_MAGIC_PREFIXES = (b"\x1a\x45\xdf\xa3", b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", b"FLV")
+
+# 415 detail for uploads that fail the signature check; keep in sync with _is_video_container
+UNSUPPORTED_VIDEO_DETAIL = "Unsupported file type. Expected an MP4, MOV, AVI, MKV, WebM, WMV or FLV video"
+
+# Alternative keyframes offered per phase when the default one is uninformative
+ALTERNATIVE_FRAME_COUNT = 5
+ALTERNATIVE_JPEG_QUALITY = 85
+# Longest gap between targets walked with grab() rather than a seek; roughly
+# one keyframe interval for typical encodes
+ALTERNATIVE_MAX_GRAB_SECONDS = 2.0
+
+# ffmpeg extracts alternative frames when installed; cv2 is the fallback
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+# cv2.imencode and the ffmpeg subprocesses release the GIL, so alternative
+# frames are extracted and encoded in parallel
+_encode_pool = ThreadPoolExecutor(max_workers=ALTERNATIVE_FRAME_COUNT, thread_name_prefix="jpeg-encode")
+
+from ...local_storage import (
+    save_metadata, get_metadata, update_metadata, update_phase, set_status, get_phase_frame,
+    get_phase_frame_base64, save_phase_frame, get_video_summary
+)
+from docuhelp.celery_app import celery_app, process_video_task
+from docuhelp.vlm.inference import run_vlm_inference_pipeline
+from docuhelp.vlm.openrouter_client import create_vlm_client
+
+
+class LocalStorage:
+    """Metadata and key frame storage backed by the local database."""
+
+    name = "local"
+
+    get = staticmethod(get_metadata)
+    save = staticmethod(save_metadata)
+    update = staticmethod(update_metadata)
+    update_phase = staticmethod(update_phase)
+    set_status = staticmethod(set_status)
+    summary = staticmethod(get_video_summary)
+    get_frame = staticmethod(get_phase_frame)
+    get_frame_base64 = staticmethod(get_phase_frame_base64)
+    save_frame = staticmethod(save_phase_frame)
+
+
+_STORAGE_BACKENDS = {"local": LocalStorage}
+
+# Storage backend, chosen once at import instead of branching in every endpoint
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+if STORAGE_BACKEND not in _STORAGE_BACKENDS:
+    raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}; expected one of {sorted(_STORAGE_BACKENDS)}")
+STORAGE = _STORAGE_BACKENDS[STORAGE_BACKEND]()
+logger.info(f"Using {STORAGE.name} storage backend")
+
+
+@functools.lru_cache(maxsize=1)
+def _vlm_client():
+    """Return a shared VLM client, so its HTTP connection pool is reused across requests."""
+    return create_vlm_client()
+
+
+class _StreamingUploadParser:
+    """
+    Incremental multipart/form-data parser for the upload endpoint.
+
+    Text fields are collected in memory; the bytes of the file part named
+    `file_field` are handed back from feed() so the caller can write them
+    to disk as they arrive instead of spooling the whole upload first.
+    """
+
+    def __init__(self, boundary: bytes, file_field: str):
+        self.file_field = file_field
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.video_path: Optional[Path] = None
+
+        self._file_chunks: List[bytes] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._name: Optional[str] = None
+        self._is_file = False
+        self._value: List[bytes] = []
+
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Parse the next chunk of the request body.
+
+        Args:
+            chunk: Raw body bytes
+
+        Returns:
+            File part bytes contained in this chunk
+        """
+        self._file_chunks = []
+        self._parser.write(chunk)
+        return self._file_chunks
 
-# # Import storage backends
-# if USE_FIREBASE:
-#     try:
-#         from ...firebase_config import upload_to_storage, save_to_firestore, get_from_firestore
-#         logger.info("Using Firebase storage backend")
-#     except Exception as e:
-#         logger.warning(f"Firebase import failed: {e}. Falling back to local storage.")
-#         USE_FIREBASE = False
+    def finalize(self) -> None:
+        """Signal the end of the request body."""
+        self._parser.finalize()
 
-# if not USE_FIREBASE:
-from ...local_storage import save_metadata, get_metadata, update_metadata
-logger.info("Using local storage backend")
+    def _on_part_begin(self):
+        self._headers = {}
+        self._name = None
+        self._is_file = False
+        self._value = []
 
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
 
-# Background task for VLM processing
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        if self._name == self.file_field and b"filename" in options:
+            self._is_file = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            self.content_type = self._headers.get(b"content-type", b"").decode("latin-1")
+
+    def _on_part_data(self, data, start, end):
+        target = self._file_chunks if self._is_file else self._value
+        target.append(bytes(data[start:end]))
+
+    def _on_part_end(self):
+        if not self._is_file and self._name:
+            self.fields[self._name] = b"".join(self._value).decode("utf-8", "replace")
+
+
+# VLM processing task, run by a Celery worker or as a FastAPI background task
 def process_video_with_vlm(video_id: str):
     """Background task to run VLM inference on uploaded video."""
     try:
         logger.info(f"Starting background VLM processing for video: {video_id}")
 
         # Update status to processing
-        update_metadata(video_id, {"status": "processing"})
-
-        # Import here to avoid circular imports
-        from docuhelp.vlm.inference import run_vlm_inference_pipeline
+        STORAGE.set_status(video_id, "processing")
 
         # Run VLM inference (extracts frames and analyzes)
         # Use 30 second minimum separation to allow for more granular phase detection
@@ -54,22 +227,182 @@ def process_video_with_vlm(video_id: str):
 
     except Exception as e:
         logger.error(f"Background VLM processing failed for {video_id}: {e}")
-        update_metadata(video_id, {
-            "status": "error",
-            "error_message": str(e)
-        })
+        STORAGE.set_status(video_id, "error", error=str(e))
 
 
-@router.post("/upload")
-async def upload_video(
-    background_tasks: BackgroundTasks,
-    video: UploadFile = File(..., description="MP4 video file"),
-    procedure: str = Form(..., description="Selected surgical procedure")
-):
+class _DirectUploadWriter:
     """
-    Upload video file and procedure selection for VLM inference.
+    Async file writer that bypasses the page cache with O_DIRECT.
+
+    Data is staged in a page-aligned 1 MiB buffer (O_DIRECT needs aligned
+    buffers and lengths) and flushed from a worker thread. The final partial
+    chunk is padded to the alignment and the file truncated to its real size.
+    """
+
+    def __init__(self, fd: int):
+        self._fd = fd
+        self._buffer = mmap.mmap(-1, DIRECT_IO_CHUNK)
+        self._filled = 0
+        self._size = 0
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["_DirectUploadWriter"]:
+        """Open path for direct writes, or return None where O_DIRECT is unsupported."""
+        if not hasattr(os, "O_DIRECT") or not FCNTL_AVAILABLE:
+            return None
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        except OSError:
+            return None
+        return cls(fd)
+
+    def _flush(self, length: int) -> None:
+        with memoryview(self._buffer) as view:
+            try:
+                written = os.write(self._fd, view[:length])
+            except OSError:
+                # Some filesystems accept O_DIRECT at open but reject the write;
+                # fall back to buffered I/O for the rest of the file
+                flags = fcntl.fcntl(self._fd, fcntl.F_GETFL)
+                fcntl.fcntl(self._fd, fcntl.F_SETFL, flags & ~os.O_DIRECT)
+                written = os.write(self._fd, view[:length])
+        if written != length:
+            raise OSError(f"Short write to upload file: {written} of {length} bytes")
+
+    async def write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            n = min(len(view), DIRECT_IO_CHUNK - self._filled)
+            self._buffer[self._filled:self._filled + n] = view[:n]
+            self._filled += n
+            view = view[n:]
+            if self._filled == DIRECT_IO_CHUNK:
+                await asyncio.to_thread(self._flush, DIRECT_IO_CHUNK)
+                self._size += DIRECT_IO_CHUNK
+                self._filled = 0
+
+    async def close(self) -> None:
+        try:
+            if self._filled:
+                padded = -(-self._filled // DIRECT_IO_ALIGN) * DIRECT_IO_ALIGN
+                self._buffer[self._filled:padded] = bytes(padded - self._filled)
+                await asyncio.to_thread(self._flush, padded)
+                self._size += self._filled
+                os.ftruncate(self._fd, self._size)
+        finally:
+            os.close(self._fd)
+            self._buffer.close()
+
+
+def _is_video_container(head: bytes) -> bool:
+    """
+    Check the leading bytes of an upload for a supported video container.
 
     Args:
+        head: At least VIDEO_SIGNATURE_LENGTH bytes from the start of the file
+
+    Returns:
+        True for MP4/MOV/M4V (ISO base media), AVI (RIFF), MKV/WebM, WMV and FLV files
+    """
+    return (
+        head[4:8] in _ISO_BMFF_BOX_TYPES
+        or (head[:4] == b"RIFF" and head[8:12] == b"AVI ")
+        or head.startswith(_VIDEO_MAGIC_PREFIXES)
+    )
+
+
+async def _receive_video_upload(request: Request, video_id: str) -> _StreamingUploadParser:
+    """
+    Stream the multipart upload body straight to disk.
+
+    The "video" part is written chunk by chunk as it arrives, so memory use
+    stays flat regardless of file size and the event loop is never blocked.
+
+    Args:
+        request: Incoming multipart/form-data request
+        video_id: ID used to name the saved file
+
+    Returns:
+        Parser holding the form fields and the uploaded file's name and type
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    upload = _StreamingUploadParser(params[b"boundary"], file_field="video")
+    video_file = None
+    head = b""
+    try:
+        try:
+            async for chunk in request.stream():
+                data = upload.feed(chunk)
+                if not data:
+                    continue
+
+                if video_file is None:
+                    # Check the container signature before anything is written to disk;
+                    # the client-supplied content type is not trusted
+                    head += b"".join(data)
+                    if len(head) < VIDEO_SIGNATURE_LENGTH:
+                        continue
+                    if not _is_video_container(head):
+                        raise HTTPException(status_code=415, detail=UNSUPPORTED_VIDEO_DETAIL)
+                    data = [head]
+
+                    upload.video_path = UPLOAD_DIR / f"{video_id}_{Path(upload.filename).name}"
+                    video_file = (
+                        _DirectUploadWriter.open(upload.video_path)
+                        or await aiofiles.open(upload.video_path, "wb")
+                    )
+
+                await video_file.write(b"".join(data))
+            upload.finalize()
+        finally:
+            if video_file is not None:
+                await video_file.close()
+    except BaseException:
+        # Don't leave a partial file behind on a disconnect or a bad stream
+        if upload.video_path is not None:
+            upload.video_path.unlink(missing_ok=True)
+        raise
+
+    if head and video_file is None:
+        raise HTTPException(status_code=415, detail=UNSUPPORTED_VIDEO_DETAIL)
+    if video_file is None:
+        raise HTTPException(status_code=422, detail="Missing video file")
+    if "procedure" not in upload.fields:
+        upload.video_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=422, detail="Missing procedure")
+
+    return upload
+
+
+@router.post(
+    "/upload",
+    # The body is streamed by hand, so describe the multipart form for the OpenAPI schema explicitly
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "video": {"type": "string", "format": "binary"},
+                            "procedure": {"type": "string"},
+                        },
+                        "required": ["video", "procedure"],
+                    }
+                }
+            },
+        }
+    },
+)
+async def upload_video(request: Request, background_tasks: BackgroundTasks):
+    """
+    Upload video file and procedure selection for VLM inference.
+
+    Expects multipart/form-data with:
         video: MP4 video file from frontend
         procedure: Selected surgical procedure category
 
@@ -77,23 +410,14 @@ async def upload_video(
         JSON response with video_id and upload status
     """
     try:
-        # Validate video file
-        if not video.content_type.startswith("video/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Expected video file, got {video.content_type}"
-            )
-
         # Generate unique video ID
         video_id = str(uuid.uuid4())
         timestamp = datetime.utcnow().isoformat()
 
-        # Save video locally
-        video_filename = f"{video_id}_{video.filename}"
-        video_path = UPLOAD_DIR / video_filename
-
-        with video_path.open("wb") as buffer:
-            shutil.copyfileobj(video.file, buffer)
+        # Save video locally while it is received
+        upload = await _receive_video_upload(request, video_id)
+        procedure = upload.fields["procedure"]
+        video_path = upload.video_path
 
         logger.info(f"Video saved locally: {video_path}")
 
@@ -101,59 +425,41 @@ async def upload_video(
         metadata = {
             "video_id": video_id,
             "procedure": procedure,
-            "video_filename": video.filename,
+            "video_filename": upload.filename,
             "local_path": str(video_path),
             "status": "uploaded",
             "uploaded_at": timestamp,
             "processed": False
         }
 
-        # Upload to cloud storage if Firebase is enabled
-        video_url = None    
-        USE_FIREBASE = False
-        if USE_FIREBASE:
-            try:
-                storage_path = f"videos/{video_id}/{video_filename}"
-                video_url = upload_to_storage(
-                    str(video_path),
-                    storage_path,
-                    content_type=video.content_type
-                )
-                metadata["video_url"] = video_url
-
-                # Save to Firestore
-                save_to_firestore("videos", video_id, metadata)
-                logger.info(f"Metadata saved to Firestore")
-
-            except Exception as e:
-                logger.warning(f"Firebase upload failed: {e}. Falling back to local storage.")
-                USE_FIREBASE = False
-
-        # Save metadata locally (always, as backup or primary)
-        if not USE_FIREBASE:
-            save_metadata(video_id, metadata)
-            logger.info(f"Metadata saved to local storage")
+        STORAGE.save(video_id, metadata)
+        logger.info(f"Metadata saved to {STORAGE.name} storage")
 
         logger.info(f"Video upload complete: {video_id}")
 
         # Start VLM processing in background
         logger.info(f"Scheduling VLM inference for video: {video_id}")
-        background_tasks.add_task(process_video_with_vlm, video_id)
+        if celery_app is not None:
+            process_video_task.delay(video_id)
+        else:
+            background_tasks.add_task(process_video_with_vlm, video_id)
 
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content={
                 "success": True,
                 "video_id": video_id,
                 "procedure": procedure,
-                "video_url": video_url if video_url else f"/api/v1/video/video/{video_id}",
+                "video_url": f"/api/v1/video/video/{video_id}",
                 "message": "Video uploaded successfully. VLM processing started.",
                 "local_path": str(video_path),
-                "storage_mode": "firebase" if USE_FIREBASE else "local",
+                "storage_mode": STORAGE.name,
                 "vlm_status": "processing"
             }
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading video: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
@@ -170,13 +476,9 @@ async def get_video(video_id: str):
     Returns:
         Video metadata from storage
     """
-    USE_FIREBASE = False
     try:
-        # Get metadata from appropriate backend
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        # Get metadata
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(
@@ -184,7 +486,7 @@ async def get_video(video_id: str):
                 detail=f"Video not found: {video_id}"
             )
 
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content=metadata
         )
@@ -196,29 +498,59 @@ async def get_video(video_id: str):
         raise HTTPException(status_code=500, detail=f"Retrieval failed: {str(e)}")
 
 
+def _status_etag(content: dict) -> str:
+    """Weak ETag over a status payload; it changes whenever any field does."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(content, sort_keys=True).encode()
+    return f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list, or *) against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" match
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
 @router.get("/{video_id}/status")
-async def get_video_status(video_id: str):
-    """Get processing status of a video."""
-    USE_FIREBASE = False
+async def get_video_status(request: Request, video_id: str):
+    """
+    Get processing status of a video.
+
+    Responses carry a weak ETag derived from the status fields, so polling
+    clients that send If-None-Match get an empty 304 until something changes.
+    """
     try:
-        # Get metadata from appropriate backend
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        # Status fields only, without loading the phases
+        summary = STORAGE.summary(video_id)
 
-        if not metadata:
+        if not summary:
             raise HTTPException(status_code=404, detail="Video not found")
 
-        return {
+        content = {
             "video_id": video_id,
-            "status": metadata.get("status", "unknown"),
-            "processed": metadata.get("processed", False),
-            "procedure": metadata.get("procedure"),
-            "vlm_latency": metadata.get("vlm_latency"),
-            "phases_count": len(metadata.get("vlm_phases", []))
+            "status": summary["status"] or "unknown",
+            "processed": summary["processed"],
+            "procedure": summary["procedure"],
+            "vlm_latency": summary["vlm_latency"],
+            "phases_count": summary["phases_count"]
         }
 
+        etag = _status_etag(content)
+        # no-cache: clients may store the response but must revalidate every poll
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        return VideoResponse(status_code=200, content=content, headers=headers)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting video status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -232,17 +564,23 @@ async def get_vlm_results(video_id: str):
     Returns:
         VLM analysis results with phases and key frames
     """
-    USE_FIREBASE = False
     try:
-        # Get metadata from appropriate backend
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        # Get metadata
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(status_code=404, detail="Video not found")
 
+        phases = metadata.get("vlm_phases", [])
+
+        # Local storage keeps key frames out of the metadata; other backends may
+        # still inline them, so project the base64 out of the summary (too large)
+        phases_summary = [
+            {k: v for k, v in phase.items() if k != "key_frame_data"}
+            | ({"has_key_frame": True} if "key_frame_data" in phase else {})
+            for phase in phases
+        ]
+
         # Check if VLM processing is complete
         if not metadata.get("processed", False):
             status = metadata.get("status", "unknown")
@@ -250,7 +588,7 @@ async def get_vlm_results(video_id: str):
             # If processing failed, return error status
             if status == "error":
                 error_message = metadata.get("error_message", "Unknown error occurred during processing")
-                return JSONResponse(
+                return VideoResponse(
                     status_code=500,
                     content={
                         "video_id": video_id,
@@ -261,30 +599,21 @@ async def get_vlm_results(video_id: str):
                     }
                 )
 
-            # Otherwise still processing
-            return JSONResponse(
+            # Otherwise still processing; phases parsed so far from the
+            # streamed VLM response are included as they complete
+            return VideoResponse(
                 status_code=202,  # Accepted but not ready
                 content={
                     "video_id": video_id,
                     "status": status,
                     "message": f"VLM processing {status}. Results not ready yet.",
-                    "processed": False
+                    "processed": False,
+                    "phases": phases_summary if status == "processing" else []
                 }
             )
 
         # Return VLM results
-        phases = metadata.get("vlm_phases", [])
-
-        # Remove base64 data from phases for summary (too large)
-        phases_summary = []
-        for phase in phases:
-            phase_copy = phase.copy()
-            if "key_frame_data" in phase_copy:
-                phase_copy["has_key_frame"] = True
-                del phase_copy["key_frame_data"]  # Don't send base64 in summary
-            phases_summary.append(phase_copy)
-
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content={
                 "video_id": video_id,
@@ -303,8 +632,56 @@ async def get_vlm_results(video_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _wants_event_stream(request: Request) -> bool:
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+def _sse_event(data: dict, event: Optional[str] = None) -> bytes:
+    """Format one server-sent event with a JSON payload."""
+    payload = orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode()
+    return (f"event: {event}\n".encode() if event else b"") + b"data: " + payload + b"\n\n"
+
+
+def _description_event_stream(deltas: Iterator[str], finish: Callable[[str], dict]) -> StreamingResponse:
+    """
+    Stream a VLM description as server-sent events.
+
+    Each text delta is sent as a `{"delta": ...}` event as soon as the model
+    produces it; once the model is done, finish() persists the full text and
+    its result is sent as a final `done` event (the same payload the JSON
+    response carries). Failures are reported as an `error` event.
+
+    Args:
+        deltas: Text deltas from the VLM client
+        finish: Persists the assembled description and returns the response payload
+
+    Returns:
+        text/event-stream response
+    """
+    def events():
+        parts = []
+        try:
+            for delta in deltas:
+                parts.append(delta)
+                yield _sse_event({"delta": delta})
+            payload = finish("".join(parts))
+        except Exception as e:
+            logger.error(f"Error streaming VLM description: {str(e)}")
+            yield _sse_event({"detail": str(e)}, event="error")
+            return
+        yield _sse_event(payload, event="done")
+
+    # The sync generator is iterated in Starlette's threadpool, off the event loop
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/{video_id}/phase/{phase_index}/refine")
 async def refine_phase_description(
+    request: Request,
     video_id: str,
     phase_index: int,
     user_feedback: str = Form(..., description="User's correction/feedback for the phase")
@@ -312,6 +689,9 @@ async def refine_phase_description(
     """
     Refine a phase description based on user feedback.
 
+    Clients sending `Accept: text/event-stream` receive the description as
+    server-sent events while the VLM generates it.
+
     Args:
         video_id: Video ID
         phase_index: Index of the phase to refine (0-based)
@@ -320,13 +700,9 @@ async def refine_phase_description(
     Returns:
         Refined phase with updated description
     """
-    USE_FIREBASE = False
     try:
         # Get metadata
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(status_code=404, detail="Video not found")
@@ -339,40 +715,32 @@ async def refine_phase_description(
         phase = phases[phase_index]
         procedure = metadata.get("procedure", "Unknown")
 
-        # Get the frame data
-        frame_data = phase.get("key_frame_data")
+        # Get the frame data (stored outside the metadata, loaded only when needed)
+        frame_data = STORAGE.get_frame(video_id, phase_index)
         if not frame_data:
             raise HTTPException(status_code=404, detail="No frame data for this phase")
 
         current_description = phase.get("description", "")
 
         # Use VLM to refine the description
-        from docuhelp.vlm.openrouter_client import create_vlm_client
-        vlm_client = create_vlm_client()
+        vlm_client = _vlm_client()
 
         logger.info(f"Refining phase {phase_index} with user feedback: {user_feedback[:100]}")
 
-        refined_description = vlm_client.refine_phase_description(
-            frame_base64=frame_data,
-            current_description=current_description,
-            user_feedback=user_feedback,
-            procedure=procedure
-        )
-
-        # Update the phase description
-        phase["description"] = refined_description
-        phase["refined"] = True
-        phase["original_description"] = current_description
-        phase["user_feedback"] = user_feedback
-
-        # Update metadata
-        update_metadata(video_id, {"vlm_phases": phases})
+        def finish(refined_description: str) -> dict:
+            # Update the phase description (only this phase is rewritten)
+            phase_patch = {
+                "description": refined_description,
+                "refined": True,
+                "original_description": current_description,
+                "user_feedback": user_feedback
+            }
+            if not STORAGE.update_phase(video_id, phase_index, phase_patch):
+                raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
 
-        logger.info(f"Phase {phase_index} refined successfully")
+            logger.info(f"Phase {phase_index} refined successfully")
 
-        return JSONResponse(
-            status_code=200,
-            content={
+            return {
                 "video_id": video_id,
                 "phase_index": phase_index,
                 "refined_description": refined_description,
@@ -380,8 +748,23 @@ async def refine_phase_description(
                 "key_timestamp": phase.get("key_timestamp"),
                 "message": "Phase description refined successfully"
             }
+
+        refine_args = dict(
+            frame_base64=frame_data,
+            current_description=current_description,
+            user_feedback=user_feedback,
+            procedure=procedure
         )
 
+        if _wants_event_stream(request):
+            deltas = vlm_client.refine_phase_description(**refine_args, stream=True)
+            return _description_event_stream(
+                deltas, lambda text: finish(vlm_client.clean_refined_description(text))
+            )
+
+        refined_description = vlm_client.refine_phase_description(**refine_args)
+        return VideoResponse(status_code=200, content=finish(refined_description))
+
     except HTTPException:
         raise
     except Exception as e:
@@ -401,13 +784,9 @@ async def get_phase_key_frame(video_id: str, phase_index: int):
     Returns:
         Base64 encoded image data
     """
-    USE_FIREBASE = False
     try:
         # Get metadata
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(status_code=404, detail="Video not found")
@@ -418,12 +797,12 @@ async def get_phase_key_frame(video_id: str, phase_index: int):
             raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
 
         phase = phases[phase_index]
-        frame_data = phase.get("key_frame_data")
+        frame_data = STORAGE.get_frame_base64(video_id, phase_index)
 
         if not frame_data:
             raise HTTPException(status_code=404, detail="No key frame data for this phase")
 
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content={
                 "video_id": video_id,
@@ -442,87 +821,186 @@ async def get_phase_key_frame(video_id: str, phase_index: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{video_id}/phase/{phase_index}/alternative-frames")
-async def get_alternative_keyframes(video_id: str, phase_index: int):
+def _ffmpeg_frame_at(video_path: str, timestamp: float) -> Optional[bytes]:
     """
-    Get alternative keyframe options for a phase (for when the default is blurry/uninformative).
+    Extract one JPEG frame with an input-seeking ffmpeg subprocess.
+
+    With -ss before -i ffmpeg jumps to the nearest keyframe and decodes only
+    up to the target, with hardware decoding where available.
+
+    Returns:
+        JPEG bytes, or None if ffmpeg failed or produced no frame
+    """
+    command = [
+        FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+        "-hwaccel", "auto",
+        "-ss", f"{timestamp:.3f}", "-i", video_path,
+        "-frames:v", "1",
+        "-q:v", "3", "-f", "image2pipe", "-vcodec", "mjpeg", "-",
+    ]
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0 or not result.stdout:
+        logger.warning(f"ffmpeg frame extraction at {timestamp:.3f}s failed: "
+                       f"{result.stderr.decode(errors='replace')[-500:]}")
+        return None
+    return result.stdout
+
+
+def _ffmpeg_alternative_frames(video_path: str, timestamps: List[float]) -> Optional[List[bytes]]:
+    """
+    Extract JPEG frames at the given timestamps, one ffmpeg seek per target.
+
+    The subprocesses run concurrently on the encode pool.
+
+    Returns:
+        JPEG bytes per timestamp, or None if any frame could not be extracted
+    """
+    jpegs = list(_encode_pool.map(functools.partial(_ffmpeg_frame_at, video_path), timestamps))
+    if any(jpeg is None for jpeg in jpegs):
+        return None
+    return jpegs
+
+
+def _cv2_alternative_frames(video_path: str, timestamps: List[float]) -> List[bytes]:
+    """
+    Extract JPEG frames at the given timestamps with OpenCV.
+
+    Returns:
+        JPEG bytes per extracted frame
+    """
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        raise HTTPException(status_code=500, detail="Failed to open video")
+
+    video_fps = cap.get(cv2.CAP_PROP_FPS)
+    targets = [int(ts * video_fps) for ts in timestamps]
+    max_grab_frames = int(ALTERNATIVE_MAX_GRAB_SECONDS * video_fps)
+
+    # grab() still decodes every frame it skips, so it only beats a seek for
+    # short gaps; targets further apart than a keyframe interval are seeked to
+    position = -1
+    decoded = []
+    for frame_number in targets:
+        if position < 0 or frame_number - position > max_grab_frames:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            position = frame_number
+        while position < frame_number and cap.grab():
+            position += 1
+        if position < frame_number or not cap.grab():
+            break
+        position += 1
+
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        decoded.append(frame)
+
+    cap.release()
+
+    def encode(frame):
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, ALTERNATIVE_JPEG_QUALITY])
+        return buffer.tobytes()
+
+    return list(_encode_pool.map(encode, decoded))
+
+
+@functools.lru_cache(maxsize=16)
+def _extract_alternative_frames(video_path: str, start_seconds: float, end_seconds: float) -> tuple:
+    """
+    Decode and JPEG-encode evenly spaced frames from a phase's time range.
+
+    Uses ffmpeg subprocesses when ffmpeg is installed, otherwise OpenCV.
+    Cached so the listing request and the per-image requests that follow it
+    share a single decode pass.
 
     Args:
-        video_id: Video ID
-        phase_index: Index of the phase (0-based)
+        video_path: Path to the video file
+        start_seconds: Start of the phase
+        end_seconds: End of the phase
 
     Returns:
-        List of alternative keyframes from the phase's time range
+        Tuple of (timestamp_seconds, jpeg_bytes) pairs
     """
-    USE_FIREBASE = False
-    try:
-        import cv2
-        import base64
+    # Evenly-spaced targets across this phase's time range
+    step = (end_seconds - start_seconds) / (ALTERNATIVE_FRAME_COUNT + 1)
+    timestamps = [start_seconds + i * step for i in range(1, ALTERNATIVE_FRAME_COUNT + 1)]
 
-        # Get metadata
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+    jpegs = None
+    if FFMPEG_PATH:
+        jpegs = _ffmpeg_alternative_frames(video_path, timestamps)
+    if jpegs is None:
+        jpegs = _cv2_alternative_frames(video_path, timestamps)
 
-        if not metadata:
-            raise HTTPException(status_code=404, detail="Video not found")
+    return tuple(zip(timestamps, jpegs))
 
-        phases = metadata.get("vlm_phases", [])
 
-        if phase_index < 0 or phase_index >= len(phases):
-            raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
+def _get_alternative_frames(video_id: str, phase_index: int) -> tuple:
+    """
+    Look up a phase and return its alternative keyframes.
 
-        phase = phases[phase_index]
-        video_path = metadata.get("local_path")
+    Blocking (video decode and JPEG encode); call it off the event loop.
 
-        if not video_path or not Path(video_path).exists():
-            raise HTTPException(status_code=404, detail="Video file not found")
+    Args:
+        video_id: Video ID
+        phase_index: Index of the phase (0-based)
 
-        # Parse timestamp range to get start and end seconds
-        start_seconds = phase.get("start_seconds", 0)
-        end_seconds = phase.get("end_seconds", 60)
+    Returns:
+        Tuple of (phase, frames) where frames is as returned by _extract_alternative_frames
+    """
+    metadata = STORAGE.get(video_id)
 
-        # Open video
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise HTTPException(status_code=500, detail="Failed to open video")
+    if not metadata:
+        raise HTTPException(status_code=404, detail="Video not found")
 
-        video_fps = cap.get(cv2.CAP_PROP_FPS)
+    phases = metadata.get("vlm_phases", [])
 
-        # Extract 5 evenly-spaced frames from this phase's time range
-        duration = end_seconds - start_seconds
-        step = duration / 6  # 5 frames means 6 intervals
+    if phase_index < 0 or phase_index >= len(phases):
+        raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
 
-        alternative_frames = []
-        for i in range(1, 6):  # Get 5 alternatives
-            timestamp_sec = start_seconds + (i * step)
+    phase = phases[phase_index]
+    video_path = metadata.get("local_path")
 
-            # Seek to the frame
-            frame_number = int(timestamp_sec * video_fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+    if not video_path or not Path(video_path).exists():
+        raise HTTPException(status_code=404, detail="Video file not found")
+
+    frames = _extract_alternative_frames(
+        video_path,
+        phase.get("start_seconds", 0),
+        phase.get("end_seconds", 60),
+    )
+    return phase, frames
+
+
+@router.get("/{video_id}/phase/{phase_index}/alternative-frames")
+async def get_alternative_keyframes(video_id: str, phase_index: int):
+    """
+    Get alternative keyframe options for a phase (for when the default is blurry/uninformative).
 
-            ret, frame = cap.read()
-            if ret:
-                # Encode frame to base64
-                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                frame_base64 = base64.b64encode(buffer).decode('utf-8')
+    Args:
+        video_id: Video ID
+        phase_index: Index of the phase (0-based)
 
-                minutes = int(timestamp_sec // 60)
-                seconds = int(timestamp_sec % 60)
-                timestamp_str = f"{minutes}:{seconds:02d}"
+    Returns:
+        List of alternative keyframes from the phase's time range, each with
+        the URL its JPEG is served from
+    """
+    try:
+        phase, frames = await asyncio.to_thread(_get_alternative_frames, video_id, phase_index)
 
-                alternative_frames.append({
-                    "timestamp": timestamp_str,
-                    "timestamp_seconds": round(timestamp_sec, 2),
-                    "image_base64": frame_base64
-                })
+        alternative_frames = []
+        for k, (timestamp_sec, _) in enumerate(frames):
+            minutes = int(timestamp_sec // 60)
+            seconds = int(timestamp_sec % 60)
 
-        cap.release()
+            alternative_frames.append({
+                "timestamp": f"{minutes}:{seconds:02d}",
+                "timestamp_seconds": round(timestamp_sec, 2),
+                "url": f"/api/v1/video/{video_id}/phase/{phase_index}/alternative-frames/{k}"
+            })
 
         logger.info(f"Generated {len(alternative_frames)} alternative frames for phase {phase_index}")
 
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content={
                 "video_id": video_id,
@@ -539,34 +1017,70 @@ async def get_alternative_keyframes(video_id: str, phase_index: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{video_id}/phase/{phase_index}/alternative-frames/{frame_index}")
+async def get_alternative_keyframe_image(video_id: str, phase_index: int, frame_index: int):
+    """
+    Get one alternative keyframe as a JPEG image.
+
+    Args:
+        video_id: Video ID
+        phase_index: Index of the phase (0-based)
+        frame_index: Index into the phase's alternative frames (0-based)
+
+    Returns:
+        JPEG image
+    """
+    try:
+        _, frames = await asyncio.to_thread(_get_alternative_frames, video_id, phase_index)
+
+        if frame_index < 0 or frame_index >= len(frames):
+            raise HTTPException(status_code=404, detail=f"Alternative frame {frame_index} not found")
+
+        return Response(
+            content=frames[frame_index][1],
+            media_type="image/jpeg",
+            headers={"Cache-Control": "private, max-age=3600"}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting alternative keyframe image: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/{video_id}/phase/{phase_index}/update-keyframe")
 async def update_phase_keyframe(
+    request: Request,
     video_id: str,
     phase_index: int,
-    new_timestamp: float = Form(..., description="New timestamp in seconds"),
-    new_image_base64: str = Form(..., description="New keyframe image as base64")
+    alternative_index: Optional[int] = Form(None, description="Index into the phase's alternative frames"),
+    new_timestamp: Optional[float] = Form(None, description="New timestamp in seconds"),
+    new_image_base64: Optional[str] = Form(None, description="New keyframe image as base64")
 ):
     """
     Update the keyframe for a phase with a user-selected alternative and regenerate description.
 
+    The new keyframe is either a reference to one of the phase's alternative
+    frames, whose JPEG is already cached on the server, or an uploaded image
+    with its timestamp.
+
+    Clients sending `Accept: text/event-stream` receive the new description
+    as server-sent events while the VLM generates it.
+
     Args:
         video_id: Video ID
         phase_index: Index of the phase
-        new_timestamp: New timestamp in seconds
-        new_image_base64: New keyframe image data
+        alternative_index: Alternative frame to use, as listed by alternative-frames
+        new_timestamp: New timestamp in seconds (with new_image_base64)
+        new_image_base64: New keyframe image data (with new_timestamp)
 
     Returns:
         Updated phase information with regenerated description
     """
-    USE_FIREBASE = False
     try:
-        from ...vlm.openrouter_client import create_vlm_client
-
         # Get metadata
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(status_code=404, detail="Video not found")
@@ -577,20 +1091,41 @@ async def update_phase_keyframe(
         if phase_index < 0 or phase_index >= len(phases):
             raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
 
+        if alternative_index is not None:
+            # Reuse the JPEG extracted for the alternative-frames listing
+            _, frames = await asyncio.to_thread(_get_alternative_frames, video_id, phase_index)
+            if alternative_index < 0 or alternative_index >= len(frames):
+                raise HTTPException(status_code=404, detail=f"Alternative frame {alternative_index} not found")
+            timestamp_sec, new_image = frames[alternative_index]
+            new_timestamp = round(timestamp_sec, 2)
+        elif new_image_base64 is not None and new_timestamp is not None:
+            # Decode once on ingress; the image is kept as raw JPEG bytes from here on
+            try:
+                new_image = base64.b64decode(new_image_base64, validate=True)
+            except binascii.Error:
+                raise HTTPException(status_code=400, detail="new_image_base64 is not valid base64")
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Provide alternative_index, or new_timestamp with new_image_base64"
+            )
+
         # Update the phase with new keyframe
         minutes = int(new_timestamp // 60)
         seconds = int(new_timestamp % 60)
         new_timestamp_str = f"{minutes}:{seconds:02d}"
 
-        phases[phase_index]["key_frame_data"] = new_image_base64
-        phases[phase_index]["key_timestamp"] = new_timestamp_str
-        phases[phase_index]["key_timestamp_seconds"] = new_timestamp
-        phases[phase_index]["keyframe_updated"] = True
+        phase_patch = {
+            "has_key_frame": True,
+            "key_timestamp": new_timestamp_str,
+            "key_timestamp_seconds": new_timestamp,
+            "keyframe_updated": True
+        }
 
         # Regenerate description based on new keyframe
         logger.info(f"Regenerating description for phase {phase_index} with new keyframe")
 
-        vlm_client = create_vlm_client()
+        vlm_client = _vlm_client()
 
         # Create prompt for description generation
         prompt = f"""You are analyzing a surgical video of a {procedure}.
@@ -605,28 +1140,33 @@ Describe:
 
 Keep the description professional, concise (2-3 sentences), and focused on what is visible in the image."""
 
-        # Generate new description
-        new_description = vlm_client.generate_description(new_image_base64, prompt)
-
-        # Update the description
-        phases[phase_index]["description"] = new_description
-        phases[phase_index]["description_regenerated"] = True
+        def finish(new_description: str) -> dict:
+            # Update the description
+            phase_patch["description"] = new_description
+            phase_patch["description_regenerated"] = True
 
-        # Update metadata
-        update_metadata(video_id, {"vlm_phases": phases})
+            # Update metadata (only this phase is rewritten)
+            STORAGE.save_frame(video_id, phase_index, new_image)
+            if not STORAGE.update_phase(video_id, phase_index, phase_patch):
+                raise HTTPException(status_code=404, detail=f"Phase {phase_index} not found")
 
-        logger.info(f"Updated keyframe and regenerated description for phase {phase_index}")
+            logger.info(f"Updated keyframe and regenerated description for phase {phase_index}")
 
-        return JSONResponse(
-            status_code=200,
-            content={
+            return {
                 "video_id": video_id,
                 "phase_index": phase_index,
                 "new_timestamp": new_timestamp_str,
                 "new_description": new_description,
                 "message": "Keyframe updated and description regenerated successfully"
             }
-        )
+
+        if _wants_event_stream(request):
+            deltas = vlm_client.generate_description(new_image, prompt, stream=True)
+            return _description_event_stream(deltas, lambda text: finish(text.strip()))
+
+        # Generate new description
+        new_description = vlm_client.generate_description(new_image, prompt)
+        return VideoResponse(status_code=200, content=finish(new_description))
 
     except HTTPException:
         raise
@@ -635,6 +1175,56 @@ Keep the description professional, concise (2-3 sentences), and focused on what
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Surgical report sections, formatted once per report / per phase
+_REPORT_RULE = "=" * 80
+_REPORT_SUBRULE = "-" * 80
+
+_REPORT_HEADER = f"""{_REPORT_RULE}
+SURGICAL PROCEDURE DOCUMENTATION REPORT
+{_REPORT_RULE}
+
+PROCEDURE INFORMATION
+{_REPORT_SUBRULE}
+Procedure Type: {{procedure}}
+Date of Documentation: {{uploaded_at}}
+Total Phases Documented: {{phases_count}}
+
+Total Procedure Duration: {{total_minutes}}:{{total_seconds:02d}}
+
+
+SURGICAL PHASES - CHRONOLOGICAL DOCUMENTATION
+{_REPORT_RULE}
+
+"""
+
+_REPORT_PHASE = f"""PHASE {{idx}}
+{_REPORT_SUBRULE}
+Time Range: {{timestamp_range}}
+{{status}}
+Description:
+{{description}}
+
+"""
+
+_REPORT_REFINED_STATUS = "Status: Clinician-Reviewed and Refined\n"
+
+_REPORT_FOOTER = f"""{_REPORT_RULE}
+END OF SURGICAL DOCUMENTATION REPORT
+{_REPORT_RULE}
+
+Note: This report was generated using AI-assisted surgical video analysis.
+All phases have been reviewed and approved by clinical personnel."""
+
+
+def _report_cache_key(procedure: str, uploaded_at: str, phases: list) -> str:
+    """Hash the inputs the report is built from, to detect when it must be rebuilt."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps([procedure, uploaded_at, phases], option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps([procedure, uploaded_at, phases], sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 @router.post("/{video_id}/generate-report")
 async def generate_surgical_report(video_id: str):
     """
@@ -646,13 +1236,9 @@ async def generate_surgical_report(video_id: str):
     Returns:
         Professional surgical report (text-only, no images)
     """
-    USE_FIREBASE = False
     try:
         # Get metadata
-        if USE_FIREBASE:
-            metadata = get_from_firestore("videos", video_id)
-        else:
-            metadata = get_metadata(video_id)
+        metadata = STORAGE.get(video_id)
 
         if not metadata:
             raise HTTPException(status_code=404, detail="Video not found")
@@ -664,6 +1250,21 @@ async def generate_surgical_report(video_id: str):
         if not phases:
             raise HTTPException(status_code=400, detail="No phases found for this video")
 
+        # The report is deterministic in its inputs, so reuse it while they are unchanged
+        report_key = _report_cache_key(procedure, uploaded_at, phases)
+        if metadata.get("report_key") == report_key and "surgical_report" in metadata:
+            logger.info(f"Returning cached surgical report for video {video_id}")
+            return VideoResponse(
+                status_code=200,
+                content={
+                    "video_id": video_id,
+                    "procedure": procedure,
+                    "phases_count": len(phases),
+                    "report": metadata["surgical_report"],
+                    "message": "Surgical report generated successfully"
+                }
+            )
+
         # Sort phases chronologically by start_seconds
         sorted_phases = sorted(
             phases,
@@ -671,70 +1272,34 @@ async def generate_surgical_report(video_id: str):
         )
 
         # Generate professional report
-        report_lines = []
-
-        # Header
-        report_lines.append("=" * 80)
-        report_lines.append("SURGICAL PROCEDURE DOCUMENTATION REPORT")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-
-        # Procedure Information
-        report_lines.append("PROCEDURE INFORMATION")
-        report_lines.append("-" * 80)
-        report_lines.append(f"Procedure Type: {procedure}")
-        report_lines.append(f"Date of Documentation: {uploaded_at}")
-        report_lines.append(f"Total Phases Documented: {len(sorted_phases)}")
-        report_lines.append("")
-
-        # Calculate total duration
-        if sorted_phases:
-            total_duration_seconds = sorted_phases[-1].get("end_seconds", 0)
-            total_minutes = int(total_duration_seconds // 60)
-            total_seconds = int(total_duration_seconds % 60)
-            report_lines.append(f"Total Procedure Duration: {total_minutes}:{total_seconds:02d}")
-        report_lines.append("")
-        report_lines.append("")
+        total_duration_seconds = sorted_phases[-1].get("end_seconds", 0)
+        report = io.StringIO()
+        report.write(_REPORT_HEADER.format(
+            procedure=procedure,
+            uploaded_at=uploaded_at,
+            phases_count=len(sorted_phases),
+            total_minutes=int(total_duration_seconds // 60),
+            total_seconds=int(total_duration_seconds % 60),
+        ))
 
         # Detailed Phase Documentation
-        report_lines.append("SURGICAL PHASES - CHRONOLOGICAL DOCUMENTATION")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-
         for idx, phase in enumerate(sorted_phases, 1):
-            timestamp_range = phase.get("timestamp_range", "N/A")
-            description = phase.get("description", "No description available")
-            refined = phase.get("refined", False)
-
-            report_lines.append(f"PHASE {idx}")
-            report_lines.append("-" * 80)
-            report_lines.append(f"Time Range: {timestamp_range}")
-
-            if refined:
-                report_lines.append(f"Status: Clinician-Reviewed and Refined")
-
-            report_lines.append("")
-            report_lines.append(f"Description:")
-            report_lines.append(f"{description}")
-            report_lines.append("")
-
-        # Footer
-        report_lines.append("=" * 80)
-        report_lines.append("END OF SURGICAL DOCUMENTATION REPORT")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-        report_lines.append("Note: This report was generated using AI-assisted surgical video analysis.")
-        report_lines.append("All phases have been reviewed and approved by clinical personnel.")
+            report.write(_REPORT_PHASE.format(
+                idx=idx,
+                timestamp_range=phase.get("timestamp_range", "N/A"),
+                status=_REPORT_REFINED_STATUS if phase.get("refined", False) else "",
+                description=phase.get("description", "No description available"),
+            ))
 
-        # Join into final report
-        final_report = "\n".join(report_lines)
+        report.write(_REPORT_FOOTER)
+        final_report = report.getvalue()
 
         # Save report to metadata
-        update_metadata(video_id, {"surgical_report": final_report})
+        STORAGE.update(video_id, {"surgical_report": final_report, "report_key": report_key})
 
         logger.info(f"Generated surgical report for video {video_id}")
 
-        return JSONResponse(
+        return VideoResponse(
             status_code=200,
             content={
                 "video_id": video_id,
@@ -1,6 +1,6 @@
 """Firebase configuration and initialization."""
+import functools
 import os
-import json
 from pathlib import Path
 from typing import Optional
 import firebase_admin
@@ -13,6 +13,10 @@ _firebase_initialized = False
 _firestore_client = None
 _storage_bucket = None
 
+# Default service account location: firebase-credentials.json in the project root
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_DEFAULT_CREDENTIALS = _PROJECT_ROOT / 'firebase-credentials.json'
+
 
 def initialize_firebase(credentials_path: Optional[str] = None) -> None:
     """
@@ -29,29 +33,30 @@ def initialize_firebase(credentials_path: Optional[str] = None) -> None:
         logger.info("Firebase already initialized")
         return
 
-    # Determine credentials path
-    if credentials_path is None:
-        # Check environment variable first
-        credentials_path = os.getenv('FIREBASE_CREDENTIALS')
-
-        # Fall back to default location
-        if credentials_path is None:
-            project_root = Path(__file__).parent.parent.parent.parent
-            default_path = project_root / 'firebase-credentials.json'
-            if default_path.exists():
-                credentials_path = str(default_path)
+    # Determine credentials path: argument, then environment variable, then default location
+    credentials_path = (
+        credentials_path
+        or os.getenv('FIREBASE_CREDENTIALS')
+        or (str(_DEFAULT_CREDENTIALS) if _DEFAULT_CREDENTIALS.is_file() else None)
+    )
 
     # Initialize Firebase
     try:
-        if credentials_path and Path(credentials_path).exists():
+        cred = None
+        if credentials_path:
+            # Certificate opens the file itself, so a missing file is caught here
+            # instead of being checked with a separate stat() first
+            try:
+                cred = credentials.Certificate(credentials_path)
+            except FileNotFoundError:
+                logger.warning(f"Firebase credentials file not found: {credentials_path}")
+
+        if cred is not None:
             logger.info(f"Initializing Firebase with credentials from: {credentials_path}")
-            cred = credentials.Certificate(credentials_path)
 
-            # Get storage bucket from credentials
-            with open(credentials_path, 'r') as f:
-                cred_data = json.load(f)
-                project_id = cred_data.get('project_id')
-                bucket_name = os.getenv('FIREBASE_STORAGE_BUCKET', f"{project_id}.appspot.com")
+            # Get storage bucket from credentials; Certificate has already parsed the file
+            project_id = cred.project_id
+            bucket_name = os.getenv('FIREBASE_STORAGE_BUCKET', f"{project_id}.appspot.com")
 
             firebase_admin.initialize_app(cred, {
                 'storageBucket': bucket_name
@@ -71,17 +76,17 @@ def initialize_firebase(credentials_path: Optional[str] = None) -> None:
         raise
 
 
+@functools.lru_cache(maxsize=1)
 def get_firestore_client():
-    """Get Firestore client instance."""
-    if not _firebase_initialized:
-        initialize_firebase()
+    """Get the shared Firestore client instance, initializing Firebase on first use."""
+    initialize_firebase()
     return _firestore_client
 
 
+@functools.lru_cache(maxsize=1)
 def get_storage_bucket():
-    """Get Firebase Storage bucket instance."""
-    if not _firebase_initialized:
-        initialize_firebase()
+    """Get the shared Firebase Storage bucket instance, initializing Firebase on first use."""
+    initialize_firebase()
     return _storage_bucket
 
 
@@ -1,39 +1,305 @@
 """
 Local storage module for metadata when Firebase is not used.
-Stores video metadata in JSON files.
+Stores video metadata in a SQLite database (WAL mode).
+
+Each video is one row in `videos`, each phase one row in `phases`, and each
+phase key frame a JPEG blob in `frames`, so status reads and single-phase
+edits touch only the rows they need. Metadata from the earlier per-video
+JSON files is imported on first access.
 """
+import base64
 import json
 import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Storage directory for metadata
 METADATA_DIR = Path("frontend/uploads/metadata")
 METADATA_DIR.mkdir(parents=True, exist_ok=True)
 
+DB_PATH = METADATA_DIR / "docuhelp.db"
+
+# Per-phase key frames written by earlier versions, read only when importing legacy metadata
+PHASES_DIR = Path("frontend/uploads/phases")
+
+# Top-level metadata fields mirrored into columns, for queries that skip the JSON
+_VIDEO_COLUMNS = ("procedure", "status", "processed", "uploaded_at", "local_path",
+                  "vlm_summary", "vlm_latency", "model")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    procedure TEXT,
+    status TEXT,
+    processed INTEGER,
+    uploaded_at TEXT,
+    local_path TEXT,
+    vlm_summary TEXT,
+    vlm_latency REAL,
+    model TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phases (
+    video_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    timestamp_range TEXT,
+    start_s REAL,
+    end_s REAL,
+    description TEXT,
+    refined INTEGER,
+    key_timestamp TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (video_id, idx)
+);
+CREATE TABLE IF NOT EXISTS frames (
+    video_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    jpeg BLOB NOT NULL,
+    PRIMARY KEY (video_id, idx)
+);
+"""
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert numpy scalars and arrays for the stdlib encoder, as orjson does natively."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(data: Any) -> str:
+    if ORJSON_AVAILABLE:
+        # Frame timestamps and latencies may arrive as numpy scalars
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(data, default=_json_default)
+
+
+def _loads(text: str) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _connection() -> sqlite3.Connection:
+    """Return this thread's database connection, creating the schema on first use."""
+    global _schema_ready
+
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _local.conn = conn
+
+    if not _schema_ready:
+        with _schema_lock:
+            if not _schema_ready:
+                conn.executescript(_SCHEMA)
+                _schema_ready = True
+
+    return conn
+
+
+@contextmanager
+def _transaction(immediate: bool = False):
+    """
+    Run a block in one transaction.
+
+    Args:
+        immediate: Take the write lock up front, so a read-modify-write
+            never interleaves with another writer
+    """
+    conn = _connection()
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _write_phase(conn: sqlite3.Connection, video_id: str, idx: int, phase: Dict[str, Any]) -> None:
+    """Store one phase, moving any base64 key_frame_data into the frames table."""
+    if "key_frame_data" in phase:
+        phase = dict(phase)
+        frame_data = phase.pop("key_frame_data")
+        if frame_data:
+            conn.execute(
+                "INSERT OR REPLACE INTO frames (video_id, idx, jpeg) VALUES (?, ?, ?)",
+                (video_id, idx, base64.b64decode(frame_data))
+            )
+        else:
+            conn.execute("DELETE FROM frames WHERE video_id = ? AND idx = ?", (video_id, idx))
+        phase["has_key_frame"] = bool(frame_data)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO phases (video_id, idx, timestamp_range, start_s, end_s, description,"
+        " refined, key_timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            video_id, idx,
+            phase.get("timestamp_range"),
+            phase.get("start_seconds"),
+            phase.get("end_seconds"),
+            phase.get("description"),
+            int(bool(phase.get("refined", False))),
+            phase.get("key_timestamp"),
+            _dumps(phase),
+        )
+    )
+
+
+def _write_video(conn: sqlite3.Connection, video_id: str, data: Dict[str, Any]) -> None:
+    """Store a full metadata record; phases are replaced only when vlm_phases is present."""
+    record = {key: value for key, value in data.items() if key != "vlm_phases"}
+    conn.execute(
+        f"INSERT OR REPLACE INTO videos (video_id, {', '.join(_VIDEO_COLUMNS)}, data)"
+        f" VALUES ({', '.join('?' * (len(_VIDEO_COLUMNS) + 2))})",
+        (video_id, *(record.get(column) for column in _VIDEO_COLUMNS), _dumps(record))
+    )
+
+    if "vlm_phases" in data:
+        phases = data["vlm_phases"]
+        conn.execute("DELETE FROM phases WHERE video_id = ? AND idx >= ?", (video_id, len(phases)))
+        conn.execute("DELETE FROM frames WHERE video_id = ? AND idx >= ?", (video_id, len(phases)))
+        for idx, phase in enumerate(phases):
+            _write_phase(conn, video_id, idx, phase)
+
+
+def _read_video(conn: sqlite3.Connection, video_id: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute("SELECT data FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+    if row is None:
+        return None
+
+    data = _loads(row[0])
+    phases = conn.execute(
+        "SELECT data FROM phases WHERE video_id = ? ORDER BY idx", (video_id,)
+    ).fetchall()
+    if phases:
+        data["vlm_phases"] = [_loads(phase[0]) for phase in phases]
+    return data
+
+
+def _import_legacy_json(video_id: str) -> bool:
+    """
+    Import metadata written as a JSON file by earlier versions.
+
+    Returns:
+        True if a legacy file was found and imported
+    """
+    metadata_file = METADATA_DIR / f"{video_id}.json"
+    if not metadata_file.exists():
+        return False
+
+    data = _loads(metadata_file.read_bytes())
+    for idx, phase in enumerate(data.get("vlm_phases", [])):
+        frame_file = PHASES_DIR / video_id / f"{idx}.jpg"
+        if "key_frame_data" not in phase and frame_file.exists():
+            phase["key_frame_data"] = base64.b64encode(frame_file.read_bytes()).decode("ascii")
+
+    with _transaction(immediate=True) as conn:
+        if conn.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone() is None:
+            _write_video(conn, video_id, data)
+
+    try:
+        metadata_file.rename(metadata_file.with_suffix(".json.imported"))
+    except FileNotFoundError:
+        pass  # Imported concurrently by another worker
+    logger.info(f"Imported legacy metadata: {video_id}")
+    return True
+
+
+def get_phase_frame(video_id: str, phase_index: int) -> Optional[bytes]:
+    """
+    Read the key frame JPEG for a phase.
+
+    Args:
+        video_id: Unique video identifier
+        phase_index: Index of the phase (0-based)
+
+    Returns:
+        JPEG bytes or None if the phase has no key frame
+    """
+    try:
+        row = _connection().execute(
+            "SELECT jpeg FROM frames WHERE video_id = ? AND idx = ?", (video_id, phase_index)
+        ).fetchone()
+        if row is None and _import_legacy_json(video_id):
+            return get_phase_frame(video_id, phase_index)
+        return row[0] if row is not None else None
+
+    except Exception as e:
+        logger.error(f"Error retrieving phase frame: {e}")
+        return None
+
+
+def save_phase_frame(video_id: str, phase_index: int, jpeg: bytes) -> None:
+    """
+    Store the key frame JPEG for a phase.
+
+    Args:
+        video_id: Unique video identifier
+        phase_index: Index of the phase (0-based)
+        jpeg: Raw JPEG bytes
+    """
+    with _transaction(immediate=True) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO frames (video_id, idx, jpeg) VALUES (?, ?, ?)",
+            (video_id, phase_index, jpeg)
+        )
+
+
+def get_phase_frame_base64(video_id: str, phase_index: int) -> Optional[str]:
+    """
+    Read the key frame for a phase as a base64 string.
+
+    Args:
+        video_id: Unique video identifier
+        phase_index: Index of the phase (0-based)
+
+    Returns:
+        Base64 encoded JPEG or None if the phase has no key frame
+    """
+    frame = get_phase_frame(video_id, phase_index)
+    return base64.b64encode(frame).decode("ascii") if frame is not None else None
+
 
 def save_metadata(video_id: str, data: Dict[str, Any]) -> None:
     """
-    Save video metadata to local JSON file.
+    Save video metadata to the local database.
 
     Args:
         video_id: Unique video identifier
         data: Metadata dictionary to save
     """
     try:
-        metadata_file = METADATA_DIR / f"{video_id}.json"
-
         # Add timestamp if not present
         if "saved_at" not in data:
             data["saved_at"] = datetime.utcnow().isoformat()
 
-        with open(metadata_file, "w") as f:
-            json.dump(data, f, indent=2)
+        with _transaction(immediate=True) as conn:
+            _write_video(conn, video_id, data)
 
-        logger.info(f"Metadata saved locally: {metadata_file}")
+        logger.info(f"Metadata saved locally: {video_id}")
 
     except Exception as e:
         logger.error(f"Error saving metadata: {e}")
@@ -42,7 +308,10 @@ def save_metadata(video_id: str, data: Dict[str, Any]) -> None:
 
 def get_metadata(video_id: str) -> Optional[Dict[str, Any]]:
     """
-    Retrieve video metadata from local JSON file.
+    Retrieve video metadata from the local database.
+
+    Phase key frames are not included; each phase carries has_key_frame and
+    the image is read with get_phase_frame.
 
     Args:
         video_id: Unique video identifier
@@ -51,16 +320,15 @@ def get_metadata(video_id: str) -> Optional[Dict[str, Any]]:
         Metadata dictionary or None if not found
     """
     try:
-        metadata_file = METADATA_DIR / f"{video_id}.json"
+        with _transaction() as conn:
+            data = _read_video(conn, video_id)
 
-        if not metadata_file.exists():
+        if data is None:
+            if _import_legacy_json(video_id):
+                return get_metadata(video_id)
             logger.warning(f"Metadata not found: {video_id}")
             return None
 
-        with open(metadata_file, "r") as f:
-            data = json.load(f)
-
-        logger.info(f"Metadata retrieved: {video_id}")
         return data
 
     except Exception as e:
@@ -68,10 +336,54 @@ def get_metadata(video_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def get_video_summary(video_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve the status fields of a video without loading its full metadata.
+
+    Args:
+        video_id: Unique video identifier
+
+    Returns:
+        Dictionary with status, processed, procedure, vlm_latency and
+        phases_count, or None if not found
+    """
+    try:
+        row = _connection().execute(
+            "SELECT status, processed, procedure, vlm_latency,"
+            " (SELECT COUNT(*) FROM phases WHERE phases.video_id = videos.video_id)"
+            " FROM videos WHERE video_id = ?",
+            (video_id,)
+        ).fetchone()
+
+        if row is None:
+            if _import_legacy_json(video_id):
+                return get_video_summary(video_id)
+            logger.warning(f"Metadata not found: {video_id}")
+            return None
+
+        status, processed, procedure, vlm_latency, phases_count = row
+        return {
+            "status": status,
+            "processed": bool(processed),
+            "procedure": procedure,
+            "vlm_latency": vlm_latency,
+            "phases_count": phases_count,
+        }
+
+    except Exception as e:
+        logger.error(f"Error retrieving video summary: {e}")
+        return None
+
+
 def update_metadata(video_id: str, updates: Dict[str, Any]) -> bool:
     """
     Update existing metadata with new fields.
 
+    Only the video row is read and merged; phases are rewritten only when
+    the updates carry vlm_phases. The merge runs in a single write
+    transaction, so concurrent updates to the same video never overwrite
+    each other.
+
     Args:
         video_id: Unique video identifier
         updates: Dictionary of fields to update
@@ -80,24 +392,115 @@ def update_metadata(video_id: str, updates: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        existing = get_metadata(video_id)
-        if not existing:
-            logger.error(f"Cannot update non-existent metadata: {video_id}")
-            return False
+        with _transaction(immediate=True) as conn:
+            row = conn.execute("SELECT data FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+            if row is not None:
+                # Merge updates
+                existing = _loads(row[0])
+                existing.update(updates)
+                existing["updated_at"] = datetime.utcnow().isoformat()
+
+                _write_video(conn, video_id, existing)
+                return True
+
+        if _import_legacy_json(video_id):
+            return update_metadata(video_id, updates)
+        logger.error(f"Cannot update non-existent metadata: {video_id}")
+        return False
 
-        # Merge updates
-        existing.update(updates)
-        existing["updated_at"] = datetime.utcnow().isoformat()
+    except Exception as e:
+        logger.error(f"Error updating metadata: {e}")
+        return False
 
-        save_metadata(video_id, existing)
-        return True
+
+def set_status(video_id: str, status: str, error: Optional[str] = None) -> bool:
+    """
+    Record a processing status without reading or re-serializing the metadata.
+
+    Args:
+        video_id: Unique video identifier
+        status: New status value
+        error: Error message; when given, the video is also marked unprocessed
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        now = datetime.utcnow().isoformat()
+        if error is None:
+            cursor = _connection().execute(
+                "UPDATE videos SET status = ?,"
+                " data = json_set(data, '$.status', ?, '$.updated_at', ?) WHERE video_id = ?",
+                (status, status, now, video_id)
+            )
+        else:
+            cursor = _connection().execute(
+                "UPDATE videos SET status = ?, processed = 0,"
+                " data = json_set(data, '$.status', ?, '$.error_message', ?,"
+                " '$.processed', json('false'), '$.updated_at', ?) WHERE video_id = ?",
+                (status, status, error, now, video_id)
+            )
+
+        if cursor.rowcount:
+            return True
+        if _import_legacy_json(video_id):
+            return set_status(video_id, status, error)
+        logger.error(f"Cannot update non-existent metadata: {video_id}")
+        return False
 
     except Exception as e:
-        logger.error(f"Error updating metadata: {e}")
+        logger.error(f"Error updating status: {e}")
+        return False
+
+
+def update_phase(video_id: str, phase_index: int, patch: Dict[str, Any], create: bool = False) -> bool:
+    """
+    Update fields of a single phase.
+
+    Only that phase's row (and frame, if key_frame_data is in the patch) is
+    rewritten, so concurrent edits to different phases are all kept.
+
+    Args:
+        video_id: Unique video identifier
+        phase_index: Index of the phase (0-based)
+        patch: Dictionary of phase fields to update
+        create: Insert the phase from `patch` if it doesn't exist yet, e.g.
+            while phases are streamed in one at a time
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with _transaction(immediate=True) as conn:
+            if conn.execute("SELECT 1 FROM videos WHERE video_id = ?", (video_id,)).fetchone() is not None:
+                row = conn.execute(
+                    "SELECT data FROM phases WHERE video_id = ? AND idx = ?", (video_id, phase_index)
+                ).fetchone()
+                if row is None and not create:
+                    logger.error(f"Cannot update non-existent phase {phase_index}: {video_id}")
+                    return False
+
+                phase = _loads(row[0]) if row is not None else {}
+                phase.update(patch)
+                _write_phase(conn, video_id, phase_index, phase)
+
+                conn.execute(
+                    "UPDATE videos SET data = json_set(data, '$.updated_at', ?) WHERE video_id = ?",
+                    (datetime.utcnow().isoformat(), video_id)
+                )
+                return True
+
+        if _import_legacy_json(video_id):
+            return update_phase(video_id, phase_index, patch, create)
+        logger.error(f"Cannot update non-existent metadata: {video_id}")
+        return False
+
+    except Exception as e:
+        logger.error(f"Error updating phase: {e}")
         return False
 
 
-def list_all_videos() -> list:
+def list_all_videos() -> List[str]:
     """
     List all video IDs in local storage.
 
@@ -105,9 +508,18 @@ def list_all_videos() -> list:
         List of video IDs
     """
     try:
-        video_ids = []
-        for file in METADATA_DIR.glob("*.json"):
-            video_ids.append(file.stem)
+        video_ids = [row[0] for row in _connection().execute("SELECT video_id FROM videos")]
+        stored = set(video_ids)
+
+        # Legacy JSON files not imported yet; DirEntry carries the file type,
+        # so no Path objects or per-entry stat() calls are needed
+        with os.scandir(METADATA_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".json") and not name.startswith(".") and entry.is_file(follow_symlinks=False):
+                    video_id = name[:-5]
+                    if video_id not in stored:
+                        video_ids.append(video_id)
         return video_ids
 
     except Exception as e:
@@ -117,7 +529,7 @@ def list_all_videos() -> list:
 
 def delete_metadata(video_id: str) -> bool:
     """
-    Delete metadata file.
+    Delete a video's metadata, phases and key frames.
 
     Args:
         video_id: Unique video identifier
@@ -126,10 +538,18 @@ def delete_metadata(video_id: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        metadata_file = METADATA_DIR / f"{video_id}.json"
-
-        if metadata_file.exists():
-            metadata_file.unlink()
+        legacy_file = METADATA_DIR / f"{video_id}.json"
+        deleted = legacy_file.exists()
+        legacy_file.unlink(missing_ok=True)
+        # Already-imported legacy files are kept renamed; remove those too
+        legacy_file.with_suffix(".json.imported").unlink(missing_ok=True)
+
+        with _transaction(immediate=True) as conn:
+            deleted |= conn.execute("DELETE FROM videos WHERE video_id = ?", (video_id,)).rowcount > 0
+            conn.execute("DELETE FROM phases WHERE video_id = ?", (video_id,))
+            conn.execute("DELETE FROM frames WHERE video_id = ?", (video_id,))
+
+        if deleted:
             logger.info(f"Metadata deleted: {video_id}")
             return True
         else:
@@ -2,18 +2,169 @@
 VLM Inference Pipeline
 Processes uploaded videos and runs OpenRouter VLM inference.
 """
+import bisect
+import functools
 import logging
+import math
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Iterable, Optional, List, Tuple
 import json
 import re
+import time
 
 from docuhelp.vlm.video_processor import extract_frames_from_video, get_video_info
 from docuhelp.vlm.openrouter_client import create_vlm_client
-from docuhelp.ui.local_storage import get_metadata, update_metadata
+from docuhelp.ui.local_storage import get_metadata, update_metadata, update_phase, set_status
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once here since parse_vlm_response runs them for every line
+# Conversational preamble: everything before the first **PROCEDURE header, or an
+# "Okay,"/"I'm ready"/"Here is" opening line, removed in a single scan
+PREAMBLE_RE = re.compile(
+    r'^.*?(?=\*\*PROCEDURE)|^Okay[,.].*?(?=\n)|^I\'m ready.*?(?=\n)|^Here is.*?(?=\n)',
+    re.DOTALL | re.MULTILINE
+)
+# One line of the cleaned response per match, classified by the named group that
+# matched: section markers, a "0:00-0:45" phase range, numbered sub-headers and
+# **bold** headings (skipped), or description text. Alternatives are tried in the
+# same priority the parser checks them, and [^\S\n] keeps whitespace on one line.
+LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<phases>.*\*\*SURGICAL PHASES\*\*.*)'
+    r'|(?P<section>.*\*\*(?:PROCEDURE OVERVIEW|CLINICAL OBSERVATIONS|ACCOUNTABILITY MARKERS'
+    r'|TECHNICAL QUALITY|PROCEDURE-SPECIFIC)\*\*.*)'
+    r'|.*?(?P<ts>(?P<start_min>\d{1,2}):(?P<start_sec>\d{2})-(?P<end_min>\d{1,2}):(?P<end_sec>\d{2})).*'
+    r'|(?P<subheader>\d+\.[^\S\n]*\*\*.*)'
+    r'|(?P<heading>(?=\*\*).*\*\*)'
+    r'|(?P<body>\S(?:.*\S)?)'
+    r')[^\S\n]*$',
+    re.MULTILINE
+)
+BULLET_RE = re.compile(r'^[\d\.\-\*\#\>\s]+')
+LIST_MARKER_RE = re.compile(r'^[\d\.\-\*\#\>]+\s*$')
+# "Description:"-style label and "0:08" timestamp at the start of a description
+# line; stripped after BULLET_RE, in that order
+DESCRIPTION_LABEL_RE = re.compile(
+    r'^\**(?:Description|Key timestamp|Key time stamp|Timestamp|Phase description)\*{0,2}:?\s*',
+    re.IGNORECASE
+)
+LEADING_TIMESTAMP_RE = re.compile(r'^\d{1,2}:\d{2}\s*')
+
+# Description cleanup for timestamps that leaked into the text
+DESC_TIMESTAMP_RE = re.compile(
+    r'\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2}'  # M:SS-M:SS (e.g., "0:01-0:03", "1:20-1:45")
+    r'|:\d{2}\s*-\s*\d{1,2}:\d{2}'  # :MM-M:SS (e.g., ":01-0:03")
+    r'|(?<!\S)\d{1,2}:\d{2}(?!\S)'  # Standalone timestamps like "0:02"
+)
+ORPHAN_PUNCT_RE = re.compile(r'\s+([.,;:])')
+
+
+def _strip_description_prefix(line: str) -> str:
+    """Remove leading bullets, then a label, then a timestamp from a description line."""
+    line = BULLET_RE.sub('', line, count=1)
+    line = DESCRIPTION_LABEL_RE.sub('', line, count=1)
+    return LEADING_TIMESTAMP_RE.sub('', line, count=1)
+
+
+class _PhaseScanner:
+    """
+    Single-pass state machine that collects phases from the SURGICAL PHASES section.
+
+    Each LINE_RE match is dispatched on its group name to a handler that
+    updates the phase being built. Text can be fed in pieces as long as
+    each piece ends at a line boundary.
+    """
+
+    def __init__(self, frames: List[Dict], on_phase: Optional[Callable[[int, Dict], None]] = None):
+        self.on_phase = on_phase
+        self.frame_index = _FrameIndex(frames)
+        self.phases = []
+        self.current_phase = {}
+        self.in_phase_section = False
+        self.used_frame_indices = set()  # Track used frames to ensure uniqueness
+        self.ranges_found = 0
+        self._handlers = {
+            "phases": self._enter_phases,
+            "section": self._leave_phases,
+            "ts": self._start_phase,
+            "body": self._add_description,
+        }
+
+    def feed(self, text: str):
+        """Classify every line of text in one regex pass."""
+        handlers = self._handlers
+        for match in LINE_RE.finditer(text):
+            handler = handlers.get(match.lastgroup)
+            if handler:
+                handler(match)
+
+    def finish(self) -> List[Dict]:
+        """Save the phase still being built and return all phases."""
+        if self._save_phase():
+            self.current_phase = {}
+        return self.phases
+
+    def _save_phase(self) -> bool:
+        """Complete the phase being built, if it has a description."""
+        phase = self.current_phase
+        if not (phase and phase.get("description")):
+            return False
+
+        phase["description"] = clean_description(phase["description"])
+        self.phases.append(phase)
+        if self.on_phase:
+            self.on_phase(len(self.phases) - 1, phase)
+        return True
+
+    def _enter_phases(self, match: re.Match):
+        self.in_phase_section = True
+        logger.info("Entered SURGICAL PHASES section")
+
+    def _leave_phases(self, match: re.Match):
+        # Another major section stops phase collection
+        self.in_phase_section = False
+        if self._save_phase():
+            self.current_phase = {}
+
+    def _start_phase(self, match: re.Match):
+        self.ranges_found += 1
+        if not self.in_phase_section:
+            return
+
+        # Save previous phase if exists
+        if self._save_phase():
+            logger.info(f"Saved phase: {self.current_phase['timestamp_range']}")
+
+        start_time = int(match["start_min"]) * 60 + int(match["start_sec"])
+        end_time = int(match["end_min"]) * 60 + int(match["end_sec"])
+        key_time = (start_time + end_time) / 2  # Middle of range
+
+        # Find closest unused frame to key timestamp
+        key_frame = self.frame_index.closest(key_time, self.used_frame_indices)
+
+        self.current_phase = {
+            "timestamp_range": match["ts"],
+            "start_seconds": start_time,
+            "end_seconds": end_time,
+            "key_timestamp": format_timestamp(key_time),
+            "key_timestamp_seconds": key_time,
+            "key_frame_data": key_frame["base64_image"] if key_frame else None,
+            "description": ""
+        }
+        logger.info(f"Started new phase: {match['ts']}")
+
+    def _add_description(self, match: re.Match):
+        if not (self.current_phase and self.in_phase_section):
+            return
+
+        clean_line = _strip_description_prefix(match["body"]).strip()
+        if clean_line:
+            if self.current_phase["description"]:
+                self.current_phase["description"] += " " + clean_line
+            else:
+                self.current_phase["description"] = clean_line
+
 
 def run_vlm_inference_pipeline(
     video_id: str,
@@ -27,8 +178,8 @@ def run_vlm_inference_pipeline(
     Steps:
     1. Get video metadata from local storage
     2. Extract frames from video (1 fps)
-    3. Send frames to OpenRouter VLM (Gemini)
-    4. Parse response and extract timestamps
+    3. Send frames to OpenRouter VLM (Gemini), streaming the response
+    4. Parse the response as it arrives and extract timestamps
     5. Save results back to metadata
     6. Return processed results with key frames
 
@@ -99,22 +250,32 @@ def run_vlm_inference_pipeline(
 
         logger.info(f"Extracted {len(frames)} frames")
 
-        # Step 3: Run VLM inference
+        # Step 3: Run VLM inference, streaming the response
         logger.info("Running VLM inference with OpenRouter...")
         vlm_client = create_vlm_client()
-        vlm_result = vlm_client.analyze_video_frames(frames, procedure=procedure)
+        start_time = time.time()
+        chunks = vlm_client.analyze_video_frames(frames, procedure=procedure, stream=True)
+
+        # Step 4: Parse phases while the response streams in; each finished
+        # phase is saved right away so results can be shown before the end
+        def save_phase(index: int, phase: Dict):
+            if index == 0:
+                # Replaces any phases left over from an earlier run
+                update_metadata(video_id, {"vlm_phases": [phase]})
+            else:
+                update_phase(video_id, index, phase, create=True)
 
-        logger.info(f"VLM inference completed in {vlm_result['latency']}s")
+        summary, phases = parse_vlm_response_stream(chunks, frames, on_phase=save_phase)
+        latency = round(time.time() - start_time, 2)
 
-        # Step 4: Parse VLM response to extract phases and timestamps
-        logger.info(f"VLM summary: {vlm_result['summary']}")
-        phases = parse_vlm_response(vlm_result["summary"], frames)
+        logger.info(f"VLM inference completed in {latency}s")
+        logger.info(f"VLM summary: {summary}")
         logger.info(f"Parsed {len(phases)} phases from VLM response")
         # Step 5: Update metadata with results
         update_metadata(video_id, {
-            "vlm_summary": vlm_result["summary"],
+            "vlm_summary": summary,
             "vlm_phases": phases,
-            "vlm_latency": vlm_result["latency"],
+            "vlm_latency": latency,
             "processed": True,
             "status": "completed"
         })
@@ -125,11 +286,11 @@ def run_vlm_inference_pipeline(
         return {
             "video_id": video_id,
             "procedure": procedure,
-            "summary": vlm_result["summary"],
+            "summary": summary,
             "phases": phases,
-            "latency": vlm_result["latency"],
+            "latency": latency,
             "frames_analyzed": len(frames),
-            "model": vlm_result["model"]
+            "model": vlm_client.model
         }
 
     except Exception as e:
@@ -137,17 +298,88 @@ def run_vlm_inference_pipeline(
 
         # Update metadata with error status
         try:
-            update_metadata(video_id, {
-                "status": "error",
-                "error_message": str(e),
-                "processed": False
-            })
+            set_status(video_id, "error", error=str(e))
         except:
             pass
 
         raise
 
 
+def clean_description(desc: str) -> str:
+    """Make a phase description readable by removing leaked formatting and timestamps."""
+    # Remove asterisks and timestamps that leaked into the description in
+    # one pass each, then collapse whitespace with split/join
+    desc = DESC_TIMESTAMP_RE.sub(' ', desc.replace('**', ''))
+    desc = ' '.join(desc.split())
+    # Remove any remaining orphaned punctuation
+    desc = ORPHAN_PUNCT_RE.sub(r'\1', desc)
+
+    # Capitalize first letter
+    if desc:
+        desc = desc[0].upper() + desc[1:]
+    return desc
+
+
+def _complete_phases(phases: List[Dict], summary_text: str, frames: List[Dict]) -> List[Dict]:
+    """Return the parsed phases, or phases built from the frames if none were found."""
+    # If no structured phases found, try alternative parsing or create smart fallback
+    if not phases:
+        logger.warning("No structured phases found in SURGICAL PHASES section")
+        logger.warning(f"VLM response preview: {summary_text[:500]}")
+        logger.warning("Attempting fallback: creating phases from available frames")
+
+        # Fallback: Create phases from frames automatically
+        # Divide frames into logical groups
+        if len(frames) >= 3:
+            # Create multiple phases from frames (aim for 3-5 phases)
+            num_phases = min(5, max(3, len(frames) // 3))
+            frames_per_phase = len(frames) // num_phases
+
+            for i in range(num_phases):
+                start_idx = i * frames_per_phase
+                end_idx = min((i + 1) * frames_per_phase, len(frames))
+                if start_idx >= len(frames):
+                    break
+
+                start_frame = frames[start_idx]
+                end_frame = frames[min(end_idx - 1, len(frames) - 1)]
+                mid_idx = (start_idx + end_idx) // 2
+                key_frame = frames[mid_idx] if mid_idx < len(frames) else frames[start_idx]
+
+                # Format timestamps
+                start_ts = format_timestamp(start_frame["timestamp"])
+                end_ts = format_timestamp(end_frame["timestamp"])
+
+                # Extract any description from summary
+                summary_content = extract_general_summary(summary_text)
+
+                phases.append({
+                    "timestamp_range": f"{start_ts}-{end_ts}",
+                    "start_seconds": start_frame["timestamp"],
+                    "end_seconds": end_frame["timestamp"],
+                    "key_timestamp": format_timestamp(key_frame["timestamp"]),
+                    "key_timestamp_seconds": key_frame["timestamp"],
+                    "key_frame_data": key_frame["base64_image"],
+                    "description": f"Surgical procedure phase {i+1}. {summary_content[:100]}"
+                })
+
+            logger.info(f"Created {len(phases)} fallback phases from {len(frames)} frames")
+        else:
+            # Only create single phase if very few frames
+            mid_frame = frames[len(frames) // 2] if frames else None
+            summary_content = extract_general_summary(summary_text)
+            phases = [{
+                "timestamp_range": "Full video",
+                "description": summary_content,
+                "key_timestamp": format_timestamp(mid_frame["timestamp"]) if mid_frame else "0:00",
+                "key_frame_data": mid_frame["base64_image"] if mid_frame else None
+            }]
+    else:
+        logger.info(f"Successfully parsed {len(phases)} phases with timestamp ranges")
+
+    return phases
+
+
 def parse_vlm_response(summary_text: str, frames: List[Dict]) -> List[Dict]:
     """
     Parse VLM response to extract phases with timestamps.
@@ -160,211 +392,19 @@ def parse_vlm_response(summary_text: str, frames: List[Dict]) -> List[Dict]:
         List of phases with extracted information
     """
     try:
-        phases = []
-        used_frame_indices = set()  # Track used frames to ensure uniqueness
-
         # Remove any conversational preamble (e.g., "Okay, I'm ready...")
-        clean_text = summary_text
-        # Remove common preamble patterns
-        preamble_patterns = [
-            r'^.*?(?=\*\*PROCEDURE)',  # Everything before first **PROCEDURE or **SURGICAL
-            r'^Okay[,.].*?(?=\n)',
-            r'^I\'m ready.*?(?=\n)',
-            r'^Here is.*?(?=\n)',
-        ]
-        for pattern in preamble_patterns:
-            clean_text = re.sub(pattern, '', clean_text, flags=re.DOTALL | re.MULTILINE)
+        clean_text = PREAMBLE_RE.sub('', summary_text)
 
         # Debug: Log the cleaned text to see what we're parsing
         logger.info(f"Parsing VLM response (first 1000 chars): {clean_text[:1000]}")
 
-        # Try to parse structured response
-        # Look for patterns like "0:00-0:45" or "00:00-00:45"
-        timestamp_pattern = r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})'
-
-        # Count how many timestamp patterns exist
-        timestamp_matches = re.findall(timestamp_pattern, clean_text)
-        logger.info(f"Found {len(timestamp_matches)} timestamp ranges in VLM response: {timestamp_matches}")
-
-        # Section headers to stop collecting phase descriptions
-        section_headers = [
-            "PROCEDURE OVERVIEW", "SURGICAL PHASES", "CLINICAL OBSERVATIONS",
-            "ACCOUNTABILITY MARKERS", "TECHNICAL QUALITY", "PROCEDURE-SPECIFIC"
-        ]
-
-        # Split by common delimiters
-        lines = clean_text.split('\n')
-
-        current_phase = {}
-        in_phase_section = False
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check if we're entering or leaving the SURGICAL PHASES section
-            if "**SURGICAL PHASES**" in line:
-                in_phase_section = True
-                logger.info("Entered SURGICAL PHASES section")
-                continue
-
-            # Check if we've hit another major section (stop collecting phases)
-            is_section_header = False
-            for header in section_headers:
-                if f"**{header}**" in line and header != "SURGICAL PHASES":
-                    is_section_header = True
-                    in_phase_section = False
-                    break
+        # Walk the text once, collecting phases from the SURGICAL PHASES section
+        scanner = _PhaseScanner(frames)
+        scanner.feed(clean_text)
+        phases = scanner.finish()
+        logger.info(f"Found {scanner.ranges_found} timestamp ranges in VLM response")
 
-            if is_section_header:
-                # Save current phase before moving to next section
-                if current_phase and current_phase.get("description"):
-                    phases.append(current_phase)
-                    current_phase = {}
-                continue
-
-            # Look for timestamp range (only in surgical phases section)
-            timestamp_match = re.search(timestamp_pattern, line)
-
-            if timestamp_match and in_phase_section:
-                # Save previous phase if exists
-                if current_phase and current_phase.get("description"):
-                    phases.append(current_phase)
-                    logger.info(f"Saved phase: {current_phase['timestamp_range']}")
-
-                # Start new phase
-                start_min, start_sec, end_min, end_sec = timestamp_match.groups()
-                start_time = int(start_min) * 60 + int(start_sec)
-                end_time = int(end_min) * 60 + int(end_sec)
-                key_time = (start_time + end_time) / 2  # Middle of range
-
-                # Find closest unused frame to key timestamp
-                key_frame = find_closest_frame(frames, key_time, used_frame_indices)
-
-                current_phase = {
-                    "timestamp_range": timestamp_match.group(0),
-                    "start_seconds": start_time,
-                    "end_seconds": end_time,
-                    "key_timestamp": format_timestamp(key_time),
-                    "key_timestamp_seconds": key_time,
-                    "key_frame_data": key_frame["base64_image"] if key_frame else None,
-                    "description": ""
-                }
-                logger.info(f"Started new phase: {timestamp_match.group(0)}")
-
-            elif current_phase and line and in_phase_section:
-                # Skip numbered list markers (1., 2., 3.) and sub-headers
-                if re.match(r'^\d+\.\s*\*\*', line):
-                    continue
-                if line.startswith("**") and line.endswith("**"):
-                    continue
-
-                # Add to description
-                # Remove common prefixes and unwanted labels
-                clean_line = line
-                # Remove bullets, numbers, asterisks
-                clean_line = re.sub(r'^[\d\.\-\*\#\>\s]+', '', clean_line)
-                # Remove various label patterns
-                clean_line = re.sub(r'^\**(Description|Key timestamp|Key time stamp|Timestamp|Phase description)\*{0,2}:?\s*', '', clean_line, flags=re.IGNORECASE)
-                # Remove timestamp patterns like "0:08" at the start
-                clean_line = re.sub(r'^\d{1,2}:\d{2}\s*', '', clean_line)
-
-                if clean_line.strip():
-                    if current_phase["description"]:
-                        current_phase["description"] += " " + clean_line.strip()
-                    else:
-                        current_phase["description"] = clean_line.strip()
-
-        # Add last phase
-        if current_phase and current_phase.get("description"):
-            phases.append(current_phase)
-
-        # Post-process descriptions to make them more readable
-        for phase in phases:
-            if phase.get("description"):
-                # Clean up any remaining formatting artifacts
-                desc = phase["description"]
-
-                # Remove timestamp patterns that leaked into descriptions
-                # Pattern 1: M:SS-M:SS (e.g., "0:01-0:03", "1:20-1:45") - most specific first
-                desc = re.sub(r'\s*\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2}\s*', ' ', desc)
-                # Pattern 2: :MM-M:SS or similar (e.g., ":01-0:03")
-                desc = re.sub(r'\s*:\d{2}\s*-\s*\d{1,2}:\d{2}\s*', ' ', desc)
-                # Pattern 3: Standalone timestamps like "0:02" at end or in text
-                desc = re.sub(r'\s+\d{1,2}:\d{2}\s*$', '', desc)  # At end
-                desc = re.sub(r'^\d{1,2}:\d{2}\s+', '', desc)  # At start
-                desc = re.sub(r'\s+\d{1,2}:\d{2}\s+', ' ', desc)  # In middle
-
-                # Remove multiple spaces
-                desc = re.sub(r'\s+', ' ', desc)
-                # Remove asterisks
-                desc = desc.replace('**', '')
-                # Remove any remaining orphaned punctuation
-                desc = re.sub(r'\s+([.,;:])', r'\1', desc)
-
-                # Capitalize first letter
-                if desc:
-                    desc = desc[0].upper() + desc[1:] if len(desc) > 1 else desc.upper()
-
-                phase["description"] = desc.strip()
-
-        # If no structured phases found, try alternative parsing or create smart fallback
-        if not phases:
-            logger.warning("No structured phases found in SURGICAL PHASES section")
-            logger.warning(f"VLM response preview: {summary_text[:500]}")
-            logger.warning("Attempting fallback: creating phases from available frames")
-
-            # Fallback: Create phases from frames automatically
-            # Divide frames into logical groups
-            if len(frames) >= 3:
-                # Create multiple phases from frames (aim for 3-5 phases)
-                num_phases = min(5, max(3, len(frames) // 3))
-                frames_per_phase = len(frames) // num_phases
-
-                for i in range(num_phases):
-                    start_idx = i * frames_per_phase
-                    end_idx = min((i + 1) * frames_per_phase, len(frames))
-                    if start_idx >= len(frames):
-                        break
-
-                    start_frame = frames[start_idx]
-                    end_frame = frames[min(end_idx - 1, len(frames) - 1)]
-                    mid_idx = (start_idx + end_idx) // 2
-                    key_frame = frames[mid_idx] if mid_idx < len(frames) else frames[start_idx]
-
-                    # Format timestamps
-                    start_ts = format_timestamp(start_frame["timestamp"])
-                    end_ts = format_timestamp(end_frame["timestamp"])
-
-                    # Extract any description from summary
-                    summary_content = extract_general_summary(summary_text)
-
-                    phases.append({
-                        "timestamp_range": f"{start_ts}-{end_ts}",
-                        "start_seconds": start_frame["timestamp"],
-                        "end_seconds": end_frame["timestamp"],
-                        "key_timestamp": format_timestamp(key_frame["timestamp"]),
-                        "key_timestamp_seconds": key_frame["timestamp"],
-                        "key_frame_data": key_frame["base64_image"],
-                        "description": f"Surgical procedure phase {i+1}. {summary_content[:100]}"
-                    })
-
-                logger.info(f"Created {len(phases)} fallback phases from {len(frames)} frames")
-            else:
-                # Only create single phase if very few frames
-                mid_frame = frames[len(frames) // 2] if frames else None
-                summary_content = extract_general_summary(summary_text)
-                phases = [{
-                    "timestamp_range": "Full video",
-                    "description": summary_content,
-                    "key_timestamp": format_timestamp(mid_frame["timestamp"]) if mid_frame else "0:00",
-                    "key_frame_data": mid_frame["base64_image"] if mid_frame else None
-                }]
-        else:
-            logger.info(f"Successfully parsed {len(phases)} phases with timestamp ranges")
-
-        return phases
+        return _complete_phases(phases, summary_text, frames)
 
     except Exception as e:
         logger.error(f"Error parsing VLM response: {e}")
@@ -376,6 +416,47 @@ def parse_vlm_response(summary_text: str, frames: List[Dict]) -> List[Dict]:
         }]
 
 
+
+def parse_vlm_response_stream(
+    chunks: Iterable[str],
+    frames: List[Dict],
+    on_phase: Optional[Callable[[int, Dict], None]] = None
+) -> Tuple[str, List[Dict]]:
+    """
+    Parse a streamed VLM response, extracting phases as their text arrives.
+
+    Complete lines are handed to the same scanner parse_vlm_response uses,
+    so each phase is finished as soon as the next one (or the next section)
+    starts rather than after the last token. Conversational preamble lies
+    outside the SURGICAL PHASES section and is skipped by the scanner.
+
+    Args:
+        chunks: Text deltas of the VLM response
+        frames: List of frames with timestamps
+        on_phase: Called with the index and contents of each phase as it completes
+
+    Returns:
+        Tuple of the full response text and the list of phases
+    """
+    scanner = _PhaseScanner(frames, on_phase=on_phase)
+    parts = []
+    pending = ""
+
+    for chunk in chunks:
+        parts.append(chunk)
+        pending += chunk
+        # Feed everything up to the last line break; keep the partial line
+        cut = pending.rfind("\n") + 1
+        if cut:
+            scanner.feed(pending[:cut])
+            pending = pending[cut:]
+
+    scanner.feed(pending)
+    summary_text = "".join(parts)
+    logger.info(f"Found {scanner.ranges_found} timestamp ranges in VLM response")
+    return summary_text, _complete_phases(scanner.finish(), summary_text, frames)
+
+
 def extract_general_summary(text: str) -> str:
     """Extract a general summary from VLM response if no phases found."""
     lines = text.split('\n')
@@ -389,11 +470,11 @@ def extract_general_summary(text: str) -> str:
         if line.startswith('**') and line.endswith('**'):
             continue
         # Skip list markers
-        if re.match(r'^[\d\.\-\*\#\>]+\s*$', line):
+        if LIST_MARKER_RE.match(line):
             continue
 
         # Clean the line
-        clean = re.sub(r'^[\d\.\-\*\#\>\s]+', '', line)
+        clean = BULLET_RE.sub('', line)
         if len(clean) > 20:  # Only meaningful sentences
             summary_parts.append(clean)
             if len(' '.join(summary_parts)) > 300:  # Limit length
@@ -402,6 +483,72 @@ def extract_general_summary(text: str) -> str:
     return ' '.join(summary_parts) if summary_parts else text[:300]
 
 
+class _FrameIndex:
+    """Frame timestamps sorted once so each closest-frame lookup is a binary search."""
+
+    def __init__(self, frames: List[Dict]):
+        self.frames = frames
+        # Stable sort keeps equal timestamps in frame order, matching min()'s tie-breaking
+        self.order = sorted(range(len(frames)), key=lambda i: frames[i]["timestamp"])
+        self.ts_sorted = [frames[i]["timestamp"] for i in self.order]
+
+    def _nearest(self, target_seconds: float, used_indices) -> Optional[int]:
+        """Return the frame index closest to target_seconds, skipping used_indices."""
+        order, ts_sorted = self.order, self.ts_sorted
+        n = len(order)
+        pos = bisect.bisect_left(ts_sorted, target_seconds)
+
+        # Walk outward from the insertion point past frames already taken
+        left = pos - 1
+        while left >= 0 and order[left] in used_indices:
+            left -= 1
+        # Among equal earlier timestamps prefer the lowest frame index
+        probe = left - 1
+        while probe >= 0 and ts_sorted[probe] == ts_sorted[left]:
+            if order[probe] not in used_indices:
+                left = probe
+            probe -= 1
+        right = pos
+        while right < n and order[right] in used_indices:
+            right += 1
+
+        if left < 0:
+            return order[right] if right < n else None
+        if right >= n:
+            return order[left]
+        left_gap = target_seconds - ts_sorted[left]
+        right_gap = ts_sorted[right] - target_seconds
+        if left_gap < right_gap or (left_gap == right_gap and order[left] < order[right]):
+            return order[left]
+        return order[right]
+
+    def closest(self, target_seconds: float, used_indices: set = None) -> Optional[Dict]:
+        """
+        Find frame closest to target timestamp.
+
+        Args:
+            target_seconds: Target timestamp in seconds
+            used_indices: Set of already used frame indices to avoid duplicates
+
+        Returns:
+            Closest unused frame, or None if no frames available
+        """
+        if not self.order:
+            return None
+
+        if used_indices is None:
+            used_indices = set()
+
+        index = self._nearest(target_seconds, used_indices)
+        if index is None:
+            # All frames used, return closest anyway
+            return self.frames[self._nearest(target_seconds, ())]
+
+        # Mark this frame as used
+        used_indices.add(index)
+        return self.frames[index]
+
+
 def find_closest_frame(frames: List[Dict], target_seconds: float, used_indices: set = None) -> Optional[Dict]:
     """
     Find frame closest to target timestamp.
@@ -414,40 +561,19 @@ def find_closest_frame(frames: List[Dict], target_seconds: float, used_indices:
     Returns:
         Closest unused frame, or None if no frames available
     """
-    if not frames:
-        return None
+    return _FrameIndex(frames).closest(target_seconds, used_indices)
 
-    if used_indices is None:
-        used_indices = set()
 
-    # Find all unused frames
-    available_frames = [
-        (i, f) for i, f in enumerate(frames)
-        if i not in used_indices
-    ]
-
-    if not available_frames:
-        # All frames used, return closest anyway
-        closest_frame = min(frames, key=lambda f: abs(f["timestamp"] - target_seconds))
-        return closest_frame
-
-    # Find closest unused frame
-    closest_idx, closest_frame = min(
-        available_frames,
-        key=lambda x: abs(x[1]["timestamp"] - target_seconds)
-    )
-
-    # Mark this frame as used
-    used_indices.add(closest_idx)
-
-    return closest_frame
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    minutes, secs = divmod(seconds, 60)
+    return f"{minutes}:{secs:02d}"
 
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds as MM:SS."""
-    minutes = int(seconds // 60)
-    secs = int(seconds % 60)
-    return f"{minutes}:{secs:02d}"
+    # Cached per whole second; video timestamps repeat across phases and frames
+    return _format_whole_seconds(math.floor(seconds))
 
 
 # Legacy function for compatibility
@@ -2,15 +2,52 @@
 OpenRouter API client for VLM inference.
 Uses Gemini 2.5 Flash for video summarization via base64 frames.
 """
+import base64
 import os
 import logging
 import time
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Union
 from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
+def _image_data_url(image: Union[bytes, str]) -> str:
+    """
+    Build a data URL for a JPEG image.
+
+    Args:
+        image: Raw JPEG bytes, or an already base64 encoded string
+
+    Returns:
+        data:image/jpeg URL; bytes are base64 encoded only here, at the API boundary
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        image = base64.b64encode(image).decode("ascii")
+    return f"data:image/jpeg;base64,{image}"
+
+
+def _image_messages(prompt: str, image: Union[bytes, str]) -> List[Dict[str, any]]:
+    """Build a single user message holding a text prompt and one JPEG image."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "text",
+                    "text": prompt
+                },
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": _image_data_url(image)
+                    }
+                }
+            ]
+        }
+    ]
+
+
 class OpenRouterVLM:
     """Client for OpenRouter VLM inference using Gemini 2.5 Flash."""
 
@@ -40,8 +77,9 @@ class OpenRouterVLM:
         self,
         frames: List[Dict[str, any]],
         prompt: Optional[str] = None,
-        procedure: Optional[str] = None
-    ) -> Dict[str, any]:
+        procedure: Optional[str] = None,
+        stream: bool = False
+    ) -> Union[Dict[str, any], Iterator[str]]:
         """
         Analyze video frames using Gemini VLM.
 
@@ -49,6 +87,8 @@ class OpenRouterVLM:
             frames: List of frame dictionaries with base64_image and timestamp
             prompt: Custom prompt (uses default if None)
             procedure: Surgical procedure name for context
+            stream: Return an iterator of text deltas instead of the result
+                dictionary, so the response can be parsed while it is generated
 
         Returns:
             Dictionary containing:
@@ -58,6 +98,7 @@ class OpenRouterVLM:
                 "frames_analyzed": 120,
                 "model": "google/gemini-2.5-flash"
             }
+            or the response text deltas when streaming
         """
         try:
             logger.info(f"Analyzing {len(frames)} frames with OpenRouter VLM")
@@ -83,42 +124,18 @@ class OpenRouterVLM:
                     }
                 })
 
+            messages = [
+                {
+                    "role": "user",
+                    "content": message_content
+                }
+            ]
+            if stream:
+                return self._stream_text(messages)
+
             # Call OpenRouter API with retry logic for rate limits
             start_time = time.time()
-
-            max_retries = 5
-            base_delay = 2  # seconds
-
-            for attempt in range(max_retries):
-                try:
-                    completion = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": message_content
-                            }
-                        ]
-                    )
-                    break  # Success, exit retry loop
-
-                except Exception as e:
-                    error_str = str(e)
-
-                    # Check if it's a 429 rate limit error
-                    if "429" in error_str or "rate" in error_str.lower():
-                        if attempt < max_retries - 1:
-                            # Calculate exponential backoff delay
-                            delay = base_delay * (2 ** attempt)
-                            logger.warning(f"Rate limit hit (attempt {attempt + 1}/{max_retries}). Retrying in {delay}s...")
-                            time.sleep(delay)
-                            continue
-                        else:
-                            logger.error(f"Max retries ({max_retries}) reached for rate limit error")
-                            raise
-                    else:
-                        # Not a rate limit error, raise immediately
-                        raise
+            completion = self._create_completion(messages)
 
             end_time = time.time()
             latency = end_time - start_time
@@ -140,6 +157,46 @@ class OpenRouterVLM:
             logger.error(f"Error in VLM inference: {e}")
             raise
 
+    def _create_completion(self, messages: List[Dict[str, any]], stream: bool = False):
+        """
+        Create a chat completion, retrying rate-limited requests with exponential backoff.
+
+        Args:
+            messages: Chat messages
+            stream: Request a streaming completion
+
+        Returns:
+            Chat completion, or the completion stream when streaming
+        """
+        max_retries = 5
+        base_delay = 2  # seconds
+
+        for attempt in range(max_retries):
+            try:
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    stream=stream
+                )
+
+            except Exception as e:
+                error_str = str(e)
+
+                # Check if it's a 429 rate limit error
+                if "429" in error_str or "rate" in error_str.lower():
+                    if attempt < max_retries - 1:
+                        # Calculate exponential backoff delay
+                        delay = base_delay * (2 ** attempt)
+                        logger.warning(f"Rate limit hit (attempt {attempt + 1}/{max_retries}). Retrying in {delay}s...")
+                        time.sleep(delay)
+                        continue
+                    else:
+                        logger.error(f"Max retries ({max_retries}) reached for rate limit error")
+                        raise
+                else:
+                    # Not a rate limit error, raise immediately
+                    raise
+
     def _build_default_prompt(self, procedure: Optional[str] = None) -> str:
         """
         Build default prompt for surgical documentation.
@@ -257,30 +314,86 @@ Document all standard steps for {procedure} including:
         """
         return self.analyze_video_frames(frames, prompt=custom_prompt)
 
+    def _stream_text(self, messages: List[Dict[str, any]]) -> Iterator[str]:
+        """
+        Stream a chat completion as text deltas.
+
+        Args:
+            messages: Chat messages
+
+        Yields:
+            Text as the model generates it
+        """
+        start_time = time.time()
+        stream = self._create_completion(messages, stream=True)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+        logger.info(f"Streamed VLM response completed in {time.time() - start_time:.2f}s")
+
+    def generate_description(
+        self,
+        image: Union[bytes, str],
+        prompt: str,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
+        """
+        Describe a single keyframe.
+
+        Args:
+            image: Key frame as raw JPEG bytes (or base64 string)
+            prompt: Instructions for the description
+            stream: Return an iterator of text deltas instead of the full text
+
+        Returns:
+            Description text, or its deltas when streaming
+        """
+        messages = _image_messages(prompt, image)
+        if stream:
+            return self._stream_text(messages)
+
+        start_time = time.time()
+        completion = self._create_completion(messages)
+
+        description = completion.choices[0].message.content.strip()
+        logger.info(f"Keyframe description generated in {time.time() - start_time:.2f}s")
+        return description
+
+    @staticmethod
+    def clean_refined_description(text: str) -> str:
+        """Strip labels the model sometimes echoes from the refinement prompt."""
+        text = text.strip()
+        text = text.replace("**REFINED DESCRIPTION**:", "").strip()
+        text = text.replace("Refined Description:", "").strip()
+        text = text.replace("Description:", "").strip()
+        return text
+
     def refine_phase_description(
         self,
-        frame_base64: str,
+        frame_base64: Union[bytes, str],
         current_description: str,
         user_feedback: str,
-        procedure: str
-    ) -> str:
+        procedure: str,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Refine a phase description based on user feedback.
 
         Args:
-            frame_base64: Base64 encoded image of the key frame
+            frame_base64: Key frame as a base64 string (raw JPEG bytes are also accepted)
             current_description: Current AI-generated description
             user_feedback: User's correction/feedback
             procedure: Surgical procedure name
+            stream: Return an iterator of raw text deltas instead of the full
+                text; pass the joined result through clean_refined_description
 
         Returns:
-            Refined description text
+            Refined description text, or its deltas when streaming
         """
-        try:
-            logger.info(f"Refining phase description with user feedback: {user_feedback[:100]}")
+        logger.info(f"Refining phase description with user feedback: {user_feedback[:100]}")
 
-            # Build refinement prompt
-            refinement_prompt = f"""You are refining a surgical phase description based on expert feedback.
+        # Build refinement prompt
+        refinement_prompt = f"""You are refining a surgical phase description based on expert feedback.
 
 **CONTEXT**:
 - Procedure: {procedure}
@@ -304,40 +417,19 @@ Generate a new, improved description that:
 
 **REFINED DESCRIPTION**:"""
 
-            # Build message content with frame
-            message_content = [
-                {
-                    "type": "text",
-                    "text": refinement_prompt
-                },
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{frame_base64}"
-                    }
-                }
-            ]
+        # Build message content with frame
+        messages = _image_messages(refinement_prompt, frame_base64)
+        if stream:
+            return self._stream_text(messages)
 
+        try:
             # Call OpenRouter API
             start_time = time.time()
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": message_content
-                    }
-                ]
-            )
+            completion = self._create_completion(messages)
             end_time = time.time()
 
-            # Extract refined description
-            refined_text = completion.choices[0].message.content.strip()
-
-            # Clean up any remaining artifacts
-            refined_text = refined_text.replace("**REFINED DESCRIPTION**:", "").strip()
-            refined_text = refined_text.replace("Refined Description:", "").strip()
-            refined_text = refined_text.replace("Description:", "").strip()
+            # Extract refined description, cleaning up any remaining artifacts
+            refined_text = self.clean_refined_description(completion.choices[0].message.content)
 
             logger.info(f"Phase refinement completed in {end_time - start_time:.2f}s")
             logger.info(f"Refined description: {refined_text[:200]}")
@@ -0,0 +1,10 @@
+"""Shared pytest fixtures."""
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _scratch_cwd(tmp_path_factory):
+    """Run from a scratch directory, since storage and upload folders are created relative to the cwd."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp("cwd"))
+        yield
@@ -0,0 +1,129 @@
+"""Tests for the SQLite-backed local metadata store."""
+import base64
+import json
+import threading
+
+import pytest
+
+JPEG = b"\xff\xd8\xff\xe0fake-jpeg\xff\xd9"
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    from docuhelp.ui import local_storage
+
+    monkeypatch.setattr(local_storage, "METADATA_DIR", tmp_path)
+    monkeypatch.setattr(local_storage, "PHASES_DIR", tmp_path / "phases")
+    monkeypatch.setattr(local_storage, "DB_PATH", tmp_path / "docuhelp.db")
+    monkeypatch.setattr(local_storage, "_local", threading.local())
+    monkeypatch.setattr(local_storage, "_schema_ready", False)
+    yield local_storage
+    conn = getattr(local_storage._local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def _phase(description, frame=None):
+    phase = {"timestamp_range": "0:00-0:30", "start_seconds": 0, "end_seconds": 30,
+             "description": description}
+    if frame is not None:
+        phase["key_frame_data"] = base64.b64encode(frame).decode("ascii")
+    return phase
+
+
+def test_save_and_get_moves_key_frames_out_of_phases(storage):
+    storage.save_metadata("vid", {"procedure": "cholecystectomy", "status": "uploaded",
+                                  "vlm_phases": [_phase("first", JPEG), _phase("second")]})
+
+    metadata = storage.get_metadata("vid")
+
+    assert metadata["procedure"] == "cholecystectomy"
+    assert [p["description"] for p in metadata["vlm_phases"]] == ["first", "second"]
+    assert metadata["vlm_phases"][0]["has_key_frame"] is True
+    assert "key_frame_data" not in metadata["vlm_phases"][0]
+    assert storage.get_phase_frame("vid", 0) == JPEG
+    assert storage.get_phase_frame("vid", 1) is None
+    assert storage.get_phase_frame_base64("vid", 0) == base64.b64encode(JPEG).decode("ascii")
+
+
+def test_update_metadata_merges_and_replaces_phases(storage):
+    storage.save_metadata("vid", {"status": "uploaded",
+                                  "vlm_phases": [_phase("a", JPEG), _phase("b", JPEG), _phase("c", JPEG)]})
+
+    assert storage.update_metadata("vid", {"status": "completed", "vlm_phases": [_phase("only")]})
+
+    metadata = storage.get_metadata("vid")
+    assert metadata["status"] == "completed"
+    assert [p["description"] for p in metadata["vlm_phases"]] == ["only"]
+    assert storage.get_phase_frame("vid", 2) is None
+    assert not storage.update_metadata("missing", {"status": "completed"})
+
+
+def test_update_phase_rewrites_one_phase(storage):
+    storage.save_metadata("vid", {"vlm_phases": [_phase("a"), _phase("b")]})
+
+    assert storage.update_phase("vid", 1, {"description": "refined", "refined": True})
+    assert not storage.update_phase("vid", 2, {"description": "new"})
+    assert not storage.update_phase("missing", 0, {"description": "x"})
+
+    phases = storage.get_metadata("vid")["vlm_phases"]
+    assert [p["description"] for p in phases] == ["a", "refined"]
+    assert phases[1]["refined"] is True
+
+
+def test_update_phase_create_appends_streamed_phase(storage):
+    storage.save_metadata("vid", {"status": "processing"})
+    storage.update_metadata("vid", {"vlm_phases": [_phase("first")]})
+
+    assert storage.update_phase("vid", 1, _phase("second", JPEG), create=True)
+
+    phases = storage.get_metadata("vid")["vlm_phases"]
+    assert [p["description"] for p in phases] == ["first", "second"]
+    assert storage.get_phase_frame("vid", 1) == JPEG
+
+
+def test_set_status_records_errors(storage):
+    storage.save_metadata("vid", {"status": "processing", "processed": True})
+
+    assert storage.set_status("vid", "error", error="decode failed")
+
+    metadata = storage.get_metadata("vid")
+    assert metadata["status"] == "error"
+    assert metadata["error_message"] == "decode failed"
+    assert metadata["processed"] is False
+    assert not storage.set_status("missing", "processing")
+
+
+def test_legacy_json_is_imported_on_first_read(storage, tmp_path):
+    (tmp_path / "old.json").write_text(json.dumps({"status": "completed", "vlm_phases": [_phase("legacy")]}))
+    frame_dir = tmp_path / "phases" / "old"
+    frame_dir.mkdir(parents=True)
+    (frame_dir / "0.jpg").write_bytes(JPEG)
+
+    metadata = storage.get_metadata("old")
+
+    assert metadata["vlm_phases"][0]["description"] == "legacy"
+    assert storage.get_phase_frame("old", 0) == JPEG
+    assert (tmp_path / "old.json.imported").exists()
+
+
+def test_delete_metadata_removes_phases_and_frames(storage):
+    storage.save_metadata("vid", {"vlm_phases": [_phase("a", JPEG)]})
+
+    assert storage.delete_metadata("vid")
+
+    assert storage.get_metadata("vid") is None
+    assert storage.get_phase_frame("vid", 0) is None
+    assert not storage.delete_metadata("vid")
+
+
+def test_delete_metadata_removes_imported_legacy_file(storage, tmp_path):
+    (tmp_path / "old.json").write_text(json.dumps({"status": "completed"}))
+    assert storage.get_metadata("old")["status"] == "completed"
+    imported = tmp_path / "old.json.imported"
+    assert imported.exists()
+
+    assert storage.delete_metadata("old")
+
+    assert not imported.exists()
+    assert storage.get_metadata("old") is None
@@ -0,0 +1,31 @@
+"""Tests for the upload container signature check."""
+import pytest
+
+
+@pytest.fixture(scope="module")
+def video_routes():
+    return pytest.importorskip("docuhelp.ui.api.routes.video")
+
+
+@pytest.mark.parametrize("head", [
+    b"\x00\x00\x00\x18ftypmp42",  # MP4
+    b"\x00\x00\x00\x14ftypqt  ",  # MOV
+    b"\x00\x00\x00\x08wide\x00\x00",  # Older QuickTime
+    b"RIFF\x00\x10\x00\x00AVI ",  # AVI
+    b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01\x42\xf7\x81",  # MKV / WebM (EBML)
+    b"\x30\x26\xb2\x75\x8e\x66\xcf\x11\xa6\xd9\x00\xaa",  # WMV (ASF)
+    b"FLV\x01\x05\x00\x00\x00\x09\x00\x00\x00",  # FLV
+])
+def test_accepts_supported_containers(video_routes, head):
+    assert len(head) == video_routes.VIDEO_SIGNATURE_LENGTH
+    assert video_routes._is_video_container(head)
+
+
+@pytest.mark.parametrize("head", [
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0d",
+    b"%PDF-1.7\n%\xe2\xe3\xcf",
+    b"RIFF\x00\x10\x00\x00WAVE",
+    b"\x00" * 12,
+])
+def test_rejects_other_files(video_routes, head):
+    assert not video_routes._is_video_container(head)
@@ -0,0 +1,65 @@
+"""Tests for VideoInputParser results."""
+import json
+
+from docuhelp.dataset import video_input_parser
+from docuhelp.dataset.video_input_parser import (
+    VideoInputParser,
+    VideoInputType,
+    parse_video_input,
+    to_json,
+)
+
+
+def _local_video(tmp_path, name="clip.mp4"):
+    path = tmp_path / name
+    path.write_bytes(b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 64)
+    return path
+
+
+def test_local_file_result_supports_dict_usage(tmp_path):
+    path = _local_video(tmp_path)
+
+    parsed = parse_video_input(str(path), metadata={"procedure_type": "test"})
+
+    assert isinstance(parsed, dict)
+    assert parsed["input_type"] == VideoInputType.LOCAL_FILE.value
+    assert parsed["file_path"] == str(path)
+    assert "file_size" in parsed
+    assert "title" not in parsed
+    assert parsed.get("title", "untitled") == "untitled"
+
+    parsed["title"] = "Appendectomy"
+    assert parsed["title"] == "Appendectomy"
+
+    decoded = json.loads(json.dumps(parsed))
+    assert decoded["metadata"] == {"procedure_type": "test"}
+    assert set(decoded) == set(parsed.keys())
+
+
+def test_to_json_matches_stdlib(tmp_path, monkeypatch):
+    parsed = parse_video_input(str(_local_video(tmp_path)), metadata={"procedure_type": "tëst"})
+    encoded = to_json(parsed)
+
+    monkeypatch.setattr(video_input_parser, "MSGSPEC_AVAILABLE", False)
+    monkeypatch.setattr(video_input_parser, "ORJSON_AVAILABLE", False)
+    assert json.loads(encoded) == json.loads(to_json(parsed)) == parsed
+
+
+def test_eleven_character_local_path_is_not_youtube(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _local_video(tmp_path, "surgery.mp4")
+    _local_video(tmp_path, "surgery_mp4")
+
+    parser = VideoInputParser()
+
+    assert parser.detect_input_type("surgery.mp4") == VideoInputType.LOCAL_FILE
+    assert parser.detect_input_type("surgery_mp4") == VideoInputType.LOCAL_FILE
+    assert parser._youtube_parser is None
+
+
+def test_bare_video_id_is_youtube(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    parser = VideoInputParser()
+
+    assert parser.detect_input_type("dQw4w9WgXcQ") == VideoInputType.YOUTUBE_URL
@@ -0,0 +1,82 @@
+"""Tests for parsing streamed VLM responses."""
+import re
+
+import pytest
+
+RESPONSE = """**PROCEDURE OVERVIEW**
+Laparoscopic cholecystectomy.
+
+**SURGICAL PHASES**
+0:00-0:30
+Description: Port placement and insufflation.
+0:30-1:10
+- Dissection of Calot's triangle
+  with the hook electrode.
+
+**CLINICAL OBSERVATIONS**
+No complications observed.
+"""
+
+FRAMES = [{"timestamp": float(t), "base64_image": f"frame-{t}"} for t in range(0, 80, 5)]
+
+
+@pytest.fixture(scope="module")
+def inference():
+    return pytest.importorskip("docuhelp.vlm.inference")
+
+
+def _chunks(text, size):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("size", [1, 7, len(RESPONSE)])
+def test_stream_matches_batch_parse(inference, size):
+    summary, phases = inference.parse_vlm_response_stream(_chunks(RESPONSE, size), FRAMES)
+
+    assert summary == RESPONSE
+    assert phases == inference.parse_vlm_response(RESPONSE, FRAMES)
+    assert [p["timestamp_range"] for p in phases] == ["0:00-0:30", "0:30-1:10"]
+    assert phases[0]["description"] == "Port placement and insufflation."
+    assert phases[1]["description"] == "Dissection of Calot's triangle with the hook electrode."
+
+
+def test_on_phase_gets_each_phase_as_it_completes(inference):
+    seen = []
+
+    def on_phase(index, phase):
+        seen.append((index, phase["timestamp_range"], phase["description"]))
+
+    _, phases = inference.parse_vlm_response_stream(_chunks(RESPONSE, 5), FRAMES, on_phase=on_phase)
+
+    assert seen == [(i, p["timestamp_range"], p["description"]) for i, p in enumerate(phases)]
+
+
+def test_phases_get_distinct_key_frames(inference):
+    _, phases = inference.parse_vlm_response_stream([RESPONSE], FRAMES)
+
+    assert phases[0]["key_frame_data"] == "frame-15"
+    assert phases[1]["key_frame_data"] == "frame-50"
+
+
+def _three_step_cleanup(line):
+    line = re.sub(r'^[\d\.\-\*\#\>\s]+', '', line)
+    line = re.sub(
+        r'^\**(Description|Key timestamp|Key time stamp|Timestamp|Phase description)\*{0,2}:?\s*',
+        '', line, flags=re.IGNORECASE
+    )
+    return re.sub(r'^\d{1,2}:\d{2}\s*', '', line)
+
+
+@pytest.mark.parametrize("line", [
+    "0:08 text",
+    "12:34 Clipping the cystic duct",
+    "- Description: 0:15 Retraction of the gallbladder",
+    "**Description:** Port placement",
+    "3. **Key timestamp**: 1:05 dissection",
+    "* Timestamp 2:30 - clip applied",
+    "> Phase description: 45 seconds of irrigation",
+    "1.5 cm incision",
+    "Plain description text",
+])
+def test_description_prefix_matches_three_step_cleanup(inference, line):
+    assert inference._strip_description_prefix(line) == _three_step_cleanup(line)
@@ -0,0 +1,113 @@
+"""Tests for YouTube download results and playlist listing."""
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from docuhelp.dataset import youtube_downloader
+from docuhelp.dataset.youtube_downloader import YouTubeDownloader, _iter_playlist_videos
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+class FakeYDL:
+    """Answers extract_info(..., process=False) from a URL -> result mapping."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def extract_info(self, url, download=False, process=True, ie_key=None):
+        self.calls.append(url)
+        return self.results[url]
+
+
+def _video(video_id):
+    return {"_type": "url", "ie_key": "Youtube", "id": video_id, "url": video_id}
+
+
+def test_playlist_listing_follows_redirects_and_nested_playlists():
+    ydl = FakeYDL({
+        "https://www.youtube.com/@channel": {
+            "_type": "url", "url": "https://www.youtube.com/@channel/videos", "ie_key": "YoutubeTab",
+        },
+        "https://www.youtube.com/@channel/videos": {
+            "_type": "playlist",
+            "entries": iter([
+                _video("a"),
+                {"_type": "url", "url": "https://www.youtube.com/@channel/shorts", "ie_key": "YoutubeTab"},
+                _video("b"),
+                None,
+            ]),
+        },
+        "https://www.youtube.com/@channel/shorts": {
+            "_type": "playlist",
+            "entries": [_video("c"), _video("a")],
+        },
+    })
+
+    videos = list(_iter_playlist_videos(ydl, "https://www.youtube.com/@channel"))
+
+    assert [v["id"] for v in videos] == ["a", "c", "b"]
+
+
+def test_playlist_listing_rejects_single_videos():
+    ydl = FakeYDL({URL: {"_type": "video", "id": VIDEO_ID}})
+
+    with pytest.raises(ValueError, match="Not a valid playlist URL"):
+        list(_iter_playlist_videos(ydl, URL))
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    # The download itself is faked below, so yt-dlp only has to pass the constructor check
+    monkeypatch.setattr(youtube_downloader, "YT_DLP_AVAILABLE", True)
+    downloader = YouTubeDownloader(download_dir=tmp_path)
+
+    def fake_run_ytdlp(ydl_opts, url):
+        outtmpl = Path(ydl_opts["outtmpl"])
+        stem = outtmpl.name.replace(".%(ext)s", "")
+        (outtmpl.parent / f"{stem}.mp4").write_bytes(b"\x00")
+        (outtmpl.parent / f"{stem}.en.vtt").write_text("WEBVTT\n")
+        return {"id": VIDEO_ID, "title": "Lap Chole", "duration": 612, "fps": 30}
+
+    metadata = {
+        "video_id": VIDEO_ID,
+        "metadata": {"title": "Lap Chole", "channel": "Surgery Channel", "tags": ["surgery"]},
+    }
+    monkeypatch.setattr(downloader, "_run_ytdlp", fake_run_ytdlp)
+    monkeypatch.setattr(downloader.parser, "parse_youtube_video", lambda *args, **kwargs: metadata)
+    yield downloader
+    downloader.close()
+
+
+def test_download_result_keeps_full_metadata(downloader):
+    result = downloader.download_video(URL)
+
+    assert result["metadata"]["metadata"]["title"] == "Lap Chole"
+    assert result["metadata"]["metadata"]["tags"] == ["surgery"]
+    assert result["downloaded_at"].endswith("Z")
+    assert Path(result["video_path"]).exists()
+    assert [Path(p).name for p in result["subtitle_paths"]] == [f"{Path(result['video_path']).stem}.en.vtt"]
+    assert result["download_info"]["duration"] == 612
+
+    saved = json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8"))
+    assert saved == result["metadata"]
+    assert json.loads(Path(result["result_path"]).read_text(encoding="utf-8")) == result
+
+
+def test_async_download_writes_json(downloader):
+    result = asyncio.run(downloader.download_video_async(URL))
+
+    assert json.loads(Path(result["metadata_path"]).read_text(encoding="utf-8")) == result["metadata"]
+    assert Path(result["result_path"]).exists()
+
+
+def test_async_download_honours_write_json(downloader):
+    result = asyncio.run(downloader.download_video_async(URL, write_json=False))
+
+    assert result["metadata"]["metadata"]["title"] == "Lap Chole"
+    assert not Path(result["metadata_path"]).exists()
+    assert not Path(result["result_path"]).exists()